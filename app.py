@@ -1,12 +1,23 @@
 """Streamlit UI for displaying signals and backtest results."""
 
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+import pandas as pd
 import streamlit as st
 from pathlib import Path
 import yaml
-from signals import generate_signal
+import sentiment
+import store
+from data import load_price
+from signals import generate_signal, parse_minutes
 from backtest import backtest_strategy
 
 CONFIG_PATH = "config.yaml"
+logger = logging.getLogger(__name__)
+SIGNAL_LEVELS = {"SELL": -1, "HOLD": 0, "BUY": 1}
 
 
 def load_config():
@@ -14,21 +25,99 @@ def load_config():
         return yaml.safe_load(f)
 
 
+def _cache_ttl() -> timedelta:
+    """Return a cache TTL matching the scheduler interval."""
+    config = load_config() or {}
+    interval = config.get("schedule", {}).get("every", "30 minutes")
+    return timedelta(minutes=parse_minutes(interval))
+
+
+CACHE_TTL = _cache_ttl()
+
+
+def config_hash(config) -> str:
+    """Return a stable hash of ``config`` for use in cache keys."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@st.cache_resource
+def load_model():
+    """Share one sentiment model manager across sessions."""
+    return sentiment.get_manager()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_price(ticker: str, period: str = "6mo", interval: str = "1d"):
+    return load_price(ticker, load_config(), period=period, interval=interval)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_signal(ticker: str) -> str:
+    return generate_signal(ticker, df=cached_price(ticker))
+
+
+@st.cache_data(show_spinner=False)
+def cached_backtest(ticker: str, cfg_hash: str, data_end: str):
+    """Memoize backtests by ticker, configuration and last bar date.
+
+    ``cfg_hash`` and ``data_end`` are only part of the cache key; a new bar or
+    a config change produces a fresh run.
+    """
+    df = cached_price(ticker, period="1y", interval="1d")
+    return backtest_strategy(ticker, df=df)
+
+
+@st.cache_data(ttl=timedelta(seconds=30), show_spinner=False)
+def cached_latest():
+    return store.latest_results()
+
+
+def show_history(ticker: str) -> None:
+    rows = store.history(ticker)
+    if not rows:
+        st.info(f"No stored history for {ticker}")
+        return
+    df = pd.DataFrame(rows)
+    df["computed_at"] = pd.to_datetime(df["computed_at"])
+    df["level"] = df["signal"].map(SIGNAL_LEVELS)
+    st.line_chart(df.set_index("computed_at")[["level", "sentiment"]])
+
+
 def main():
     st.title("Stock Signals")
     config = load_config()
-    print("Loaded configuration for Streamlit app")
-    signals = {}
-    for ticker in config.get("tickers", []):
-        print(f"Generating signal for {ticker}")
-        signals[ticker] = generate_signal(ticker)
-    st.write(signals)
+    logger.info("Loaded configuration for Streamlit app")
+    tickers = config.get("tickers", [])
+
+    latest = cached_latest()
+    if latest:
+        st.subheader("Latest stored signals")
+        st.dataframe(pd.DataFrame(latest.values()).set_index("ticker"))
+    missing = [t for t in tickers if t not in latest]
+    if missing:
+        st.caption(f"No stored result yet for: {', '.join(missing)}")
+
+    if st.button("Compute live signals"):
+        load_model().preload()
+        signals = {}
+        for ticker in tickers:
+            logger.info("Generating signal for %s", ticker)
+            signals[ticker] = cached_signal(ticker)
+        st.write(signals)
+
+    if tickers:
+        st.subheader("Signal history")
+        show_history(st.selectbox("Ticker", tickers))
 
     if st.button("Run Backtest"):
         results = {}
+        cfg_hash = config_hash(config)
         for ticker in config.get("tickers", []):
-            print(f"Running backtest for {ticker}")
-            results[ticker] = backtest_strategy(ticker)
+            logger.info("Running backtest for %s", ticker)
+            df = cached_price(ticker, period="1y", interval="1d")
+            data_end = str(df.index[-1]) if not df.empty else ""
+            results[ticker] = cached_backtest(ticker, cfg_hash, data_end)
         st.write(results)
 
 
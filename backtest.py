@@ -1,14 +1,18 @@
 """Backtesting utilities using backtrader."""
 
+import logging
+
 import backtrader as bt
 import pandas as pd
 import yaml
-from data import fetch_price
-from scrape import get_tweets
-from sentiment import compute_sentiment
+import metrics
+from data import load_price
+from signals import ticker_sentiments
 
 CONFIG_PATH = "config.yaml"
 
+logger = logging.getLogger(__name__)
+
 
 def load_config():
     with open(CONFIG_PATH, "r") as f:
@@ -40,14 +44,27 @@ class SignalStrategy(bt.Strategy):
             self.order = self.sell()
 
 
-def backtest_strategy(ticker: str):
-    """Run backtest and return performance metrics."""
-    print(f"Running backtest for {ticker}")
+def backtest_strategy(
+    ticker: str, df: pd.DataFrame = None, sentiment_score: float = None
+):
+    """Run backtest and return performance metrics.
+
+    ``df`` may be supplied to reuse an already fetched one year price frame
+    and ``sentiment_score`` to reuse a score from :func:`ticker_sentiments`.
+    """
+    with metrics.span("backtest.run", ticker=ticker):
+        return _run_backtest(ticker, df, sentiment_score)
+
+
+def _run_backtest(
+    ticker: str, df: pd.DataFrame = None, sentiment_score: float = None
+):
+    logger.info("Running backtest for %s", ticker)
     config = load_config()
-    df = fetch_price(ticker, period="1y", interval="1d")
-    sentiment_score = compute_sentiment(
-        get_tweets(config.get("keywords", []))
-    )
+    if df is None:
+        df = load_price(ticker, config, period="1y", interval="1d")
+    if sentiment_score is None:
+        sentiment_score = ticker_sentiments([ticker], config)[ticker]
 
     cerebro = bt.Cerebro()
     data = bt.feeds.PandasData(dataname=df)
@@ -57,11 +74,12 @@ def backtest_strategy(ticker: str):
     )
     cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe")
     cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
-    result = cerebro.run()[0]
+    with metrics.span("backtest.cerebro", ticker=ticker):
+        result = cerebro.run()[0]
     sharpe = result.analyzers.sharpe.get_analysis().get("sharperatio", 0.0)
     dd = result.analyzers.drawdown.get_analysis().get("max", 0.0)
     final_value = cerebro.broker.getvalue()
-    print(f"Final portfolio value for {ticker}: {final_value}")
+    logger.info("Final portfolio value for %s: %s", ticker, final_value)
     return {
         "sharpe": sharpe,
         "drawdown": dd,
@@ -0,0 +1,355 @@
+"""Offline benchmark harness for the signal pipeline.
+
+All external I/O is replaced with deterministic local data: synthetic OHLCV
+frames instead of ``yfinance``, a recorded tweet corpus instead of the
+scrapers and a tiny lexicon classifier instead of the transformer model.
+
+Example::
+
+    python3 benchmark.py --scales 10 100 --output benchmarks/results.json \\
+        --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+CORPUS_PATH = Path("benchmarks/tweets.json")
+RESULTS_PATH = Path("benchmarks/results.json")
+DEFAULT_SCALES = [10, 100, 1000]
+DEFAULT_STAGES = [
+    "fetch_price",
+    "indicators",
+    "get_tweets",
+    "compute_sentiment",
+    "ticker_sentiments",
+    "generate_signal",
+    "main",
+    "backtest_strategy",
+]
+
+_POSITIVE = {"bullish", "beat", "strong", "great", "buying", "up", "higher", "breakout", "upgrade", "ripping"}
+_NEGATIVE = {"bearish", "missed", "weak", "selling", "crash", "down", "dumping", "terrible", "downgrade"}
+
+
+# ---------------------------------------------------------------------------
+# Deterministic inputs
+# ---------------------------------------------------------------------------
+
+def _seed(ticker: str) -> int:
+    return int(hashlib.sha256(ticker.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def synthetic_ohlcv(ticker: str, bars: int = 252, interval: str = "1d"):
+    """Return a reproducible OHLCV frame for ``ticker`` shaped like yfinance."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(_seed(ticker))
+    returns = rng.normal(0.0004, 0.02, bars)
+    close = 100.0 * np.exp(np.cumsum(returns))
+    open_ = close * (1 + rng.normal(0, 0.005, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, bars)))
+    volume = rng.integers(1_000_000, 50_000_000, bars)
+    index = pd.bdate_range(end="2024-06-28", periods=bars, name="Date")
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": volume,
+        },
+        index=index,
+    )
+
+
+def fake_download(ticker: str, *, period: str = "6mo", interval: str = "1d", **_):
+    # Shared with load_price so synthetic frames match the panel slices.
+    from data import PERIOD_BARS
+
+    return synthetic_ohlcv(ticker, PERIOD_BARS.get(period, 252), interval)
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[Dict[str, str]]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LexiconClassifier:
+    """Tiny stand-in for the transformers sentiment pipeline."""
+
+    def __call__(self, texts: List[str]) -> List[Dict]:
+        results = []
+        for text in texts:
+            words = set(text.lower().split())
+            pos = len(words & _POSITIVE)
+            neg = len(words & _NEGATIVE)
+            total = pos + neg
+            score = 0.5 if total == 0 else 0.5 + 0.5 * abs(pos - neg) / total
+            label = "POSITIVE" if pos >= neg else "NEGATIVE"
+            results.append({"label": label, "score": score})
+        return results
+
+
+def benchmark_config(tickers: List[str]) -> Dict:
+    return {
+        "tickers": tickers,
+        "keywords": ["stock market", "tech stocks"],
+        "queries": {t: [f"${t}", "tech stocks"] for t in tickers},
+        "thresholds": {
+            "rsi": {"buy": 30, "sell": 70},
+            "sentiment": {"buy": 0.2, "sell": -0.2},
+        },
+        "schedule": {"every": "15 minutes"},
+        "discord_webhook_url": "",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``values`` using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lo = math.floor(rank)
+    hi = math.ceil(rank)
+    if lo == hi:
+        return ordered[lo]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def summarize(latencies: List[float], items: int, wall: float, peak_bytes: int) -> Dict:
+    """Summarize per-call ``latencies`` (seconds) for a stage."""
+    return {
+        "calls": len(latencies),
+        "items": items,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+        "total_s": wall,
+        "throughput_per_s": items / wall if wall > 0 else 0.0,
+        "peak_mem_mb": peak_bytes / (1024 * 1024),
+    }
+
+
+def measure(func: Callable, args_list: List[tuple], items: Optional[int] = None) -> Dict:
+    """Call ``func`` once per entry of ``args_list`` and summarize the run.
+
+    Latencies are timed in a first pass without tracing; peak memory comes
+    from a second pass under :mod:`tracemalloc`, whose overhead would
+    otherwise inflate the timings several times over.
+    """
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for args in args_list:
+        t0 = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        for args in args_list:
+            func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(latencies, items if items is not None else len(args_list), wall, peak)
+
+
+def compare_results(
+    current: Dict, baseline: Dict, *, tolerance: float = 0.2, metric: str = "p50_ms"
+) -> List[str]:
+    """Return descriptions of stages whose ``metric`` regressed past ``tolerance``."""
+    regressions = []
+    for scale, stages in current.get("results", {}).items():
+        base_stages = baseline.get("results", {}).get(scale, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage)
+            if not base or not base.get(metric):
+                continue
+            ratio = stats[metric] / base[metric]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{stage} @ {scale} tickers: {metric} {stats[metric]:.2f} "
+                    f"vs baseline {base[metric]:.2f} (+{(ratio - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Benchmark runner
+# ---------------------------------------------------------------------------
+
+def _offline_patches(stack: ExitStack, config: Dict, corpus: List[Dict], db_path: Path) -> None:
+    """Route every external dependency of the pipeline to local data."""
+    import backtest
+    import data
+    import main
+    import scrape
+    import sentiment
+    import signals
+    import store
+
+    def fake_playwright(query: str, limit: int, **_):
+        start = _seed(query) % len(corpus)
+        rows = (corpus[start:] + corpus[:start])[:limit]
+        return [dict(r) for r in rows]
+
+    for target in (signals, main, backtest):
+        stack.enter_context(patch.object(target, "load_config", return_value=config))
+    stack.enter_context(patch.object(data.yf, "download", side_effect=fake_download))
+    stack.enter_context(patch.object(data.time, "sleep"))
+    stack.enter_context(patch.object(scrape.time, "sleep"))
+    stack.enter_context(patch.object(scrape, "fetch_with_playwright", side_effect=fake_playwright))
+    stack.enter_context(patch.object(scrape, "append_unique_csv"))
+    stack.enter_context(patch.object(sentiment, "_pipeline", LexiconClassifier()))
+    stack.enter_context(patch.object(main, "send_discord_notification"))
+    stack.enter_context(patch.object(store, "DB_PATH", db_path))
+
+
+def run_benchmarks(
+    scales: List[int],
+    stages: List[str],
+    *,
+    corpus_path: Path = CORPUS_PATH,
+    tweet_limit: int = 50,
+) -> Dict:
+    """Run the selected ``stages`` for each ticker count in ``scales``."""
+    import backtest
+    import indicators
+    import main
+    import scrape
+    import sentiment
+    import signals
+    from data import fetch_price
+
+    corpus = load_corpus(corpus_path)
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            tickers = [f"T{i:05d}" for i in range(scale)]
+            config = benchmark_config(tickers)
+            keywords = config["keywords"]
+            per_ticker = [(t,) for t in tickers]
+            stage_results: Dict[str, Dict] = {}
+            with ExitStack() as stack:
+                _offline_patches(stack, config, corpus, Path(tmp) / f"signals_{scale}.db")
+                frames = {t: fake_download(t) for t in tickers}
+                texts = scrape.get_tweets(keywords, tweet_limit)
+
+                def run_indicators(ticker):
+                    df = frames[ticker]
+                    indicators.compute_rsi(df)
+                    indicators.compute_sma(df, 50)
+                    indicators.compute_sma(df, 200)
+                    indicators.compute_macd(df)
+
+                runners = {
+                    "fetch_price": lambda: measure(fetch_price, per_ticker),
+                    "indicators": lambda: measure(run_indicators, per_ticker),
+                    "get_tweets": lambda: measure(
+                        scrape.get_tweets, [(keywords, tweet_limit)] * scale,
+                        items=scale * len(texts),
+                    ),
+                    "compute_sentiment": lambda: measure(
+                        sentiment.compute_sentiment, [(texts,)] * scale,
+                        items=scale * len(texts),
+                    ),
+                    "ticker_sentiments": lambda: measure(
+                        signals.ticker_sentiments, [(tickers, config)], items=scale
+                    ),
+                    "generate_signal": lambda: measure(signals.generate_signal, per_ticker),
+                    "main": lambda: measure(main.main, [()], items=scale),
+                    "backtest_strategy": lambda: measure(backtest.backtest_strategy, per_ticker),
+                }
+                for stage in stages:
+                    print(f"Benchmarking {stage} with {scale} tickers")
+                    stage_results[stage] = runners[stage]()
+            results[str(scale)] = stage_results
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "tweet_limit": tweet_limit,
+        },
+        "results": results,
+    }
+
+
+def format_table(report: Dict) -> str:
+    lines = [
+        f"{'scale':>6} {'stage':<18} {'p50 ms':>10} {'p95 ms':>10} "
+        f"{'p99 ms':>10} {'items/s':>12} {'peak MB':>9}"
+    ]
+    for scale, stages in report["results"].items():
+        for stage, s in stages.items():
+            lines.append(
+                f"{scale:>6} {stage:<18} {s['p50_ms']:>10.2f} {s['p95_ms']:>10.2f} "
+                f"{s['p99_ms']:>10.2f} {s['throughput_per_s']:>12.1f} {s['peak_mem_mb']:>9.2f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--stages", nargs="+", choices=DEFAULT_STAGES, default=DEFAULT_STAGES)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    parser.add_argument("--tweet-limit", type=int, default=50)
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        args.scales, args.stages, corpus_path=args.corpus, tweet_limit=args.tweet_limit
+    )
+    print(format_table(report))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        if args.save_baseline:
+            args.baseline.write_text(json.dumps(report, indent=2))
+            print(f"Baseline saved to {args.baseline}")
+        elif args.baseline.exists():
+            regressions = compare_results(
+                report, json.loads(args.baseline.read_text()), tolerance=args.tolerance
+            )
+            for line in regressions:
+                print(f"REGRESSION: {line}")
+            if regressions:
+                return 1
+            print("No regressions against baseline")
+        else:
+            print(f"Baseline {args.baseline} not found; use --save-baseline to create it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
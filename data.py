@@ -1,11 +1,19 @@
 """Data fetching utilities."""
 
 from __future__ import annotations
+import logging
 import time
+from typing import Dict, List, Optional
 
 import pandas as pd
 import yfinance as yf
 
+import http_client
+import metrics
+import replay
+
+logger = logging.getLogger(__name__)
+
 
 def fetch_price(
     ticker: str,
@@ -31,24 +39,139 @@ def fetch_price(
     pd.DataFrame
         Price dataframe provided by yfinance.
     """
-    print(f"Fetching price data for {ticker}")
-    attempt = 0
-    while attempt < retries:
-        print(f"Attempt {attempt + 1} for {ticker}")
-        try:
-            df = yf.download(
-                ticker,
-                period=period,
-                interval=interval,
-                progress=False,
-                auto_adjust=False,
-            )
-            if not df.empty:
-                print(f"Successfully fetched data for {ticker}")
-                return df
-        except Exception as exc:
-            print(f"Error fetching {ticker}: {exc}")
-        attempt += 1
-        time.sleep(delay * (2 ** attempt))
-    print(f"Returning empty DataFrame for {ticker}")
-    return pd.DataFrame()
+    logger.info("Fetching price data for %s", ticker)
+    with metrics.span("data.fetch_price", ticker=ticker):
+        attempt = 0
+        while attempt < retries:
+            if attempt:
+                metrics.incr("data.fetch_price.retries", ticker=ticker)
+            logger.debug("Attempt %d for %s", attempt + 1, ticker)
+            try:
+                with metrics.span("data.download", ticker=ticker):
+                    df = replay.io_call(
+                        "yfinance",
+                        (ticker, period, interval),
+                        yf.download,
+                        ticker,
+                        period=period,
+                        interval=interval,
+                        progress=False,
+                        auto_adjust=False,
+                        session=http_client.yfinance_session(),
+                    )
+                if not df.empty:
+                    logger.info("Successfully fetched data for %s", ticker)
+                    return df
+            except Exception as exc:
+                metrics.incr("data.fetch_price.errors", ticker=ticker)
+                logger.warning("Error fetching %s: %s", ticker, exc)
+            attempt += 1
+            time.sleep(delay * (2 ** attempt))
+        metrics.incr("data.fetch_price.failures", ticker=ticker)
+        logger.error("Returning empty DataFrame for %s", ticker)
+        return pd.DataFrame()
+
+
+# Approximate number of daily bars per yfinance period string.
+PERIOD_BARS = {"1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504, "5y": 1260}
+
+
+# yfinance periods with the calendar days they are guaranteed to cover.
+CATCH_UP_PERIODS = [
+    ("5d", 5), ("1mo", 28), ("3mo", 89), ("6mo", 180), ("1y", 360),
+    ("2y", 725), ("5y", 1820), ("10y", 3645),
+]
+SEED_PERIOD = "1y"
+
+
+def catch_up_period(last: Optional[pd.Timestamp], now: Optional[pd.Timestamp] = None) -> str:
+    """Return the shortest period that reaches back to the ``last`` stored bar.
+
+    ``None`` (nothing stored yet) returns :data:`SEED_PERIOD`.
+    """
+    if last is None:
+        return SEED_PERIOD
+    now = pd.Timestamp.now("UTC").tz_localize(None) if now is None else now
+    gap = (now - last).days + 1
+    for period, days in CATCH_UP_PERIODS:
+        if gap < days:
+            return period
+    return "max"
+
+
+def update_panel(
+    tickers: List[str],
+    root: str,
+    *,
+    interval: str = "1d",
+    period: Optional[str] = None,
+) -> int:
+    """Download new bars for ``tickers`` into the memory-mapped panel.
+
+    A new panel is seeded with :data:`SEED_PERIOD` of history. Afterwards the
+    download reaches back to the last stored bar, so bars missed while the
+    scheduler was down are caught up, and bars already stored are skipped.
+    Tickers added to the config since the panel was created are seeded and
+    added to it. ``period`` overrides both choices.
+
+    Returns
+    -------
+    int
+        Number of bars appended.
+    """
+    from panel import PricePanel, build_panel
+
+    before = 0
+    last = None
+    stored: set = set()
+    exists = PricePanel.exists(root, interval)
+    if exists:
+        existing = PricePanel.open(root, interval)
+        before = existing.length
+        stored = set(existing.tickers)
+        if existing.length:
+            last = pd.Timestamp(existing.timestamps[-1])
+        del existing
+    catch_up = period or catch_up_period(last)
+    seed = period or SEED_PERIOD
+    with metrics.span("data.update_panel", interval=interval):
+        frames = {
+            t: fetch_price(t, period=catch_up if t in stored else seed, interval=interval)
+            for t in tickers
+        }
+        panel = build_panel(root, interval, frames, tickers=tickers)
+        added = panel.length - before
+    new_tickers = len(set(tickers) - stored) if exists else 0
+    metrics.incr("data.panel_bars", added, interval=interval)
+    if new_tickers:
+        metrics.incr("data.panel_tickers_added", new_tickers, interval=interval)
+    logger.info(
+        "Appended %d bars to price panel at %s (period %s, %d new tickers)",
+        added, root, catch_up, new_tickers,
+    )
+    return added
+
+
+def load_price(
+    ticker: str,
+    config: Dict,
+    *,
+    period: str = "6mo",
+    interval: str = "1d",
+) -> pd.DataFrame:
+    """Return price data from the panel when enabled, else via :func:`fetch_price`.
+
+    Panel reads are views of the shared memory mapping, which is opened once
+    per process and reopened only after the panel is updated; tickers not
+    stored in the panel fall back to a download.
+    """
+    panel_cfg = config.get("panel") or {}
+    if panel_cfg.get("enabled"):
+        from panel import open_shared
+
+        panel = open_shared(panel_cfg.get("path", "data/panel"), interval)
+        if panel is not None and ticker in panel:
+            metrics.incr("data.panel_hits", ticker=ticker)
+            return panel.frame(ticker, PERIOD_BARS.get(period))
+        metrics.incr("data.panel_misses", ticker=ticker)
+    return fetch_price(ticker, period=period, interval=interval)
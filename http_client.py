@@ -0,0 +1,176 @@
+"""Shared pooled HTTP session for scrapers, notifications and yfinance."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import yaml
+
+import metrics
+import replay
+
+CONFIG_PATH = "config.yaml"
+
+DEFAULTS: Dict[str, Any] = {
+    "pool_size": 10,
+    "timeout": 10,
+    "retries": 3,
+    "backoff": 0.5,
+    "status_forcelist": [429, 500, 502, 503, 504],
+    "yfinance_session": True,
+}
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_session = None
+_settings: Optional[Dict[str, Any]] = None
+
+
+def load_config() -> Dict:
+    with open(CONFIG_PATH, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def settings() -> Dict[str, Any]:
+    """Return the ``http`` section of the config merged over :data:`DEFAULTS`."""
+    global _settings
+    if _settings is None:
+        try:
+            configured = load_config().get("http") or {}
+        except OSError:
+            configured = {}
+        _settings = {**DEFAULTS, **configured}
+    return _settings
+
+
+def _build_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    cfg = settings()
+    retry = Retry(
+        total=cfg["retries"],
+        backoff_factor=cfg["backoff"],
+        status_forcelist=cfg["status_forcelist"],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=cfg["pool_size"],
+        pool_maxsize=cfg["pool_size"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(_record_response)
+    return session
+
+
+def _record_response(response, *args, **kwargs):
+    """Record per-host request counts and latency for every response.
+
+    Installed as a session hook so requests made by ``yfinance`` through the
+    shared session are counted as well.
+    """
+    host = urlsplit(response.url).netloc
+    metrics.observe(
+        "http.request", response.elapsed.total_seconds(), host=host,
+        method=response.request.method,
+    )
+    metrics.incr("http.requests", host=host, status=response.status_code)
+
+
+def get_session():
+    """Return the process-wide keep-alive ``requests.Session``."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close() -> None:
+    """Close pooled connections; the next request opens a fresh session."""
+    global _session, _settings
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _settings = None
+
+
+def request(method: str, url: str, **kwargs):
+    """Send a request through the shared session using the default timeout.
+
+    Requests are recorded or replayed according to :mod:`replay`, with one
+    fixture kind per host so a fallback never serves one service's response
+    to another. In replay mode non-GET requests go to ``io.webhook_url`` when
+    it is set so a local stub can stand in for Discord.
+    """
+    kwargs.setdefault("timeout", settings()["timeout"])
+    if method != "GET" and replay.mode() == "replay":
+        stub_url = replay.settings()["webhook_url"]
+        if stub_url:
+            return _send(method, stub_url, **kwargs)
+    host = urlsplit(url).netloc
+    key = (method, redact_url(url), kwargs.get("params"), kwargs.get("json"))
+    return replay.io_call(f"http:{host}", key, _send_recordable, method, url, **kwargs)
+
+
+def redact_url(url: str) -> str:
+    """Replace the path and query of ``url`` with a digest.
+
+    Webhook URLs embed their token in the path, so fixtures only ever store
+    this form.
+    """
+    parts = urlsplit(url)
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return f"{parts.scheme}://{parts.netloc}/{digest}"
+
+
+def _send(method: str, url: str, **kwargs):
+    try:
+        return get_session().request(method, url, **kwargs)
+    except Exception:
+        metrics.incr("http.errors", host=urlsplit(url).netloc)
+        raise
+
+
+def _send_recordable(method: str, url: str, **kwargs):
+    """Send a request and strip the URL from the response before it is stored."""
+    response = _send(method, url, **kwargs)
+    if replay.mode() == "record":
+        response.url = redact_url(response.url)
+        response.request = None
+        response.history = []
+    return response
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def yfinance_session():
+    """Return the shared session for ``yfinance`` or ``None`` if disabled.
+
+    Recent ``yfinance`` releases only accept ``curl_cffi`` sessions; set
+    ``http.yfinance_session: false`` to let them manage their own.
+    """
+    if not settings().get("yfinance_session"):
+        return None
+    try:
+        return get_session()
+    except ImportError as exc:
+        logger.warning("requests not available, yfinance uses its own session: %s", exc)
+        return None
@@ -3,6 +3,8 @@
 import pandas as pd
 from technical_analysis import indicators as ta
 
+import metrics
+
 
 def compute_rsi(df: pd.DataFrame, period: int = 14) -> float:
     """Compute the Relative Strength Index.
@@ -21,7 +23,8 @@ def compute_rsi(df: pd.DataFrame, period: int = 14) -> float:
     """
     if df.empty:
         return 0.0
-    rsi_series = ta.rsi(df["Close"], period=period)
+    with metrics.span("indicators.rsi"):
+        rsi_series = ta.rsi(df["Close"], period=period)
     return float(rsi_series.iloc[-1].item())
 
 
@@ -42,7 +45,8 @@ def compute_sma(df: pd.DataFrame, period: int) -> float:
     """
     if df.empty:
         return 0.0
-    sma = ta.sma(df["Close"], period=period)
+    with metrics.span("indicators.sma"):
+        sma = ta.sma(df["Close"], period=period)
     return float(sma.iloc[-1].item())
 
 
@@ -63,5 +67,6 @@ def compute_macd(df: pd.DataFrame) -> float:
         return 0.0
 
     # ``ta.macd`` returns a Series containing the MACD histogram values.
-    macd_series = ta.macd(df["Close"])
+    with metrics.span("indicators.macd"):
+        macd_series = ta.macd(df["Close"])
     return float(macd_series.iloc[-1].item())
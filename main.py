@@ -4,34 +4,66 @@ import logging
 from pathlib import Path
 from datetime import datetime
 
-from signals import generate_signal, load_config
+import metrics
+from data import update_panel
+from signals import evaluate_signal, load_config, screen_universe, ticker_sentiments
 from notify import send_discord_notification
+from store import save_result
+from sentiment import get_manager
 
 LOG_PATH = Path("logs/app.log")
 LOG_PATH.parent.mkdir(exist_ok=True)
 logging.basicConfig(
-    filename=LOG_PATH,
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.FileHandler(LOG_PATH), logging.StreamHandler()],
 )
 
 
-def process_ticker(ticker: str):
-    print(f"Processing {ticker}")
-    config = load_config()
-    signal = generate_signal(ticker)
+def process_ticker(ticker: str, sentiment_score: float = None):
+    logging.info("Processing %s", ticker)
+    with metrics.span("main.process_ticker", ticker=ticker):
+        publish_result(evaluate_signal(ticker, sentiment_score=sentiment_score))
+
+
+def publish_result(result: dict):
+    """Store ``result`` and send its notification."""
+    ticker = result["ticker"]
+    result["computed_at"] = datetime.utcnow().isoformat()
+    save_result(result)
+    signal = result["signal"]
     message = f"{datetime.utcnow()} - {ticker}: {signal}"
     logging.info(message)
-    print(message)
     send_discord_notification(message)
 
 
 def main():
-    print("Starting main process")
+    logging.info("Starting main process")
+    # The listener keeps running between scheduled runs so events recorded
+    # outside main (model preloads and idle evictions) are written as well.
+    metrics.configure()
     config = load_config()
-    for ticker in config.get("tickers", []):
-        process_ticker(ticker)
-    print("Main process complete")
+    panel_cfg = config.get("panel") or {}
+    with metrics.span("main.run"):
+        if panel_cfg.get("enabled"):
+            update_panel(config.get("tickers", []), panel_cfg.get("path", "data/panel"))
+        if (config.get("screening") or {}).get("enabled"):
+            results, _ = screen_universe(config.get("tickers", []))
+            for result in results.values():
+                publish_result(result)
+        else:
+            tickers = config.get("tickers", [])
+            with metrics.span("main.sentiment"):
+                sentiments = ticker_sentiments(tickers, config) if tickers else {}
+            for ticker in tickers:
+                process_ticker(ticker, sentiments.get(ticker))
+    metrics.write_prometheus()
+    logging.info("Run summary:\n%s", metrics.summary_table())
+    logging.info("Sentiment model: %s", get_manager().stats())
+    # Start the next window only after reporting, so metrics recorded since
+    # the previous run (e.g. a scheduled model preload) are included.
+    metrics.reset()
+    logging.info("Main process complete")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+"""Lightweight span and counter instrumentation for the signal pipeline.
+
+Events are written as JSON lines through a :class:`logging.handlers.QueueHandler`
+so recording a span never blocks on disk I/O. Aggregates can be exported in
+Prometheus text format and summarised as a table at the end of each run.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EVENTS_PATH = Path("logs/metrics.jsonl")
+PROM_PATH = Path("logs/metrics.prom")
+PREFIX = "stock_signal"
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+event_logger = logging.getLogger("metrics.events")
+event_logger.setLevel(logging.INFO)
+event_logger.propagate = False
+
+_lock = threading.Lock()
+_timings: Dict[Key, List[float]] = {}
+_errors: Dict[Key, int] = {}
+_counters: Dict[Key, float] = {}
+_listener: Optional[QueueListener] = None
+
+
+def _key(name: str, tags: Dict) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in tags.items() if v is not None))
+
+
+def _emit(event: Dict) -> None:
+    if event_logger.handlers:
+        event["ts"] = time.time()
+        event_logger.info(json.dumps(event, default=str))
+
+
+def configure(events_path: Path = EVENTS_PATH) -> None:
+    """Start the background writer for JSON-lines events.
+
+    Calling this more than once is a no-op while the listener is running. The
+    listener is meant to live for the whole process and is drained by
+    :func:`shutdown` at interpreter exit.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    events_path = Path(events_path)
+    events_path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(events_path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    q: queue.Queue = queue.Queue(-1)
+    event_logger.addHandler(QueueHandler(q))
+    _listener = QueueListener(q, file_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown)
+
+
+def shutdown() -> None:
+    """Flush pending events and stop the background writer."""
+    global _listener
+    if _listener is None:
+        return
+    atexit.unregister(shutdown)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    for handler in list(event_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            event_logger.removeHandler(handler)
+    _listener = None
+
+
+def reset() -> None:
+    """Clear all aggregated timings and counters."""
+    with _lock:
+        _timings.clear()
+        _errors.clear()
+        _counters.clear()
+
+
+@contextmanager
+def span(name: str, **tags) -> Iterator[None]:
+    """Time the enclosed block and record it under ``name`` with ``tags``.
+
+    Exceptions are counted as errors for the span and re-raised.
+    """
+    start = time.perf_counter()
+    error: Optional[str] = None
+    try:
+        yield
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, error=error, **tags)
+
+
+def observe(name: str, duration: float, *, error: Optional[str] = None, **tags) -> None:
+    """Record a ``duration`` in seconds measured outside of :func:`span`."""
+    key = _key(name, tags)
+    with _lock:
+        _timings.setdefault(key, []).append(duration)
+        if error is not None:
+            _errors[key] = _errors.get(key, 0) + 1
+    _emit(
+        {
+            "type": "span",
+            "name": name,
+            "duration_ms": duration * 1000,
+            "tags": dict(key[1]),
+            "error": error,
+        }
+    )
+
+
+def incr(name: str, value: float = 1, **tags) -> None:
+    """Increase counter ``name`` by ``value``."""
+    key = _key(name, tags)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    _emit({"type": "counter", "name": name, "value": value, "tags": dict(key[1])})
+
+
+def _labels(name: str, tags: Tuple[Tuple[str, str], ...]) -> str:
+    pairs = [("name", name), *tags]
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def render_prometheus() -> str:
+    """Return the current aggregates in Prometheus text exposition format."""
+    with _lock:
+        timings = {k: list(v) for k, v in _timings.items()}
+        errors = dict(_errors)
+        counters = dict(_counters)
+    lines = [
+        f"# HELP {PREFIX}_span_seconds Duration of instrumented operations.",
+        f"# TYPE {PREFIX}_span_seconds summary",
+    ]
+    for (name, tags), values in sorted(timings.items()):
+        labels = _labels(name, tags)
+        lines.append(f"{PREFIX}_span_seconds_count{labels} {len(values)}")
+        lines.append(f"{PREFIX}_span_seconds_sum{labels} {sum(values):.6f}")
+    lines += [
+        f"# HELP {PREFIX}_span_errors_total Instrumented operations that raised.",
+        f"# TYPE {PREFIX}_span_errors_total counter",
+    ]
+    for (name, tags), value in sorted(errors.items()):
+        lines.append(f"{PREFIX}_span_errors_total{_labels(name, tags)} {value}")
+    lines += [
+        f"# HELP {PREFIX}_events_total Counted pipeline events.",
+        f"# TYPE {PREFIX}_events_total counter",
+    ]
+    for (name, tags), value in sorted(counters.items()):
+        lines.append(f"{PREFIX}_events_total{_labels(name, tags)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: Path = PROM_PATH) -> None:
+    """Atomically write :func:`render_prometheus` output to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(render_prometheus(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def summary_table() -> str:
+    """Return a per-run summary of spans and counters aggregated across tags."""
+    spans: Dict[str, List[float]] = {}
+    span_errors: Dict[str, int] = {}
+    counts: Dict[str, float] = {}
+    with _lock:
+        for (name, _), values in _timings.items():
+            spans.setdefault(name, []).extend(values)
+        for (name, _), value in _errors.items():
+            span_errors[name] = span_errors.get(name, 0) + value
+        for (name, _), value in _counters.items():
+            counts[name] = counts.get(name, 0) + value
+
+    lines = [
+        f"{'span':<28} {'count':>7} {'errors':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9}"
+    ]
+    for name in sorted(spans):
+        values = spans[name]
+        lines.append(
+            f"{name:<28} {len(values):>7} {span_errors.get(name, 0):>7} "
+            f"{sum(values):>9.3f} {sum(values) / len(values) * 1000:>9.1f} "
+            f"{max(values) * 1000:>9.1f}"
+        )
+    if counts:
+        lines.append("")
+        lines.append(f"{'counter':<28} {'value':>7}")
+        for name in sorted(counts):
+            lines.append(f"{name:<28} {counts[name]:>7g}")
+    return "\n".join(lines)
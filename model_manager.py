@@ -0,0 +1,161 @@
+"""Lifecycle management for large in-process models.
+
+:class:`ModelManager` loads a model on first use, unloads it after a period
+without use and can be asked to preload it ahead of a scheduled run, so the
+weights are only resident while they are needed.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def resident_bytes() -> int:
+    """Return the current resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ``ru_maxrss`` is the peak, in KiB on Linux; better than nothing.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ModelManager:
+    """Load, evict and preload a model produced by ``loader``.
+
+    Parameters
+    ----------
+    loader : callable
+        Zero-argument function returning the loaded model.
+    idle_seconds : float, optional
+        Unload the model after this long without a :meth:`get` call. ``0``
+        keeps it resident. Defaults to ``0``.
+    name : str, optional
+        Used in log messages and metric tags.
+    """
+
+    def __init__(
+        self, loader: Callable[[], Any], *, idle_seconds: float = 0, name: str = "model"
+    ) -> None:
+        self.loader = loader
+        self.idle_seconds = idle_seconds
+        self.name = name
+        self.loads = 0
+        self.evictions = 0
+        self.last_load_seconds: Optional[float] = None
+        self.last_load_bytes: Optional[int] = None
+        self._model: Any = None
+        self._last_used = 0.0
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> Any:
+        """Return the model, loading it if needed, and reset the idle clock."""
+        with self._lock:
+            if self._model is None:
+                self._load()
+            else:
+                metrics.incr("model.cache_hits", model=self.name)
+            self._last_used = time.monotonic()
+            self._schedule_eviction(self.idle_seconds)
+            return self._model
+
+    def preload(self) -> None:
+        """Load the model ahead of use, e.g. shortly before a scheduled run."""
+        logger.info("Preloading %s model", self.name)
+        metrics.incr("model.preloads", model=self.name)
+        self.get()
+
+    def evict(self) -> bool:
+        """Drop the model and return ``True`` if one was loaded.
+
+        Callers still holding a reference keep it alive until they finish.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._model is None:
+                return False
+            before = resident_bytes()
+            self.evictions += 1
+            self._model = None
+            gc.collect()
+            _empty_device_cache()
+        freed = before - resident_bytes()
+        metrics.incr("model.evictions", model=self.name)
+        logger.info(
+            "Evicted %s model, resident memory down by %.1f MB",
+            self.name, freed / (1024 * 1024),
+        )
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "last_load_seconds": self.last_load_seconds,
+            "last_load_mb": (
+                self.last_load_bytes / (1024 * 1024)
+                if self.last_load_bytes is not None else None
+            ),
+            "resident_mb": resident_bytes() / (1024 * 1024),
+        }
+
+    def _load(self) -> None:
+        logger.info("Loading %s model", self.name)
+        before = resident_bytes()
+        start = time.perf_counter()
+        with metrics.span("model.load", model=self.name):
+            self._model = self.loader()
+        self.last_load_seconds = time.perf_counter() - start
+        self.last_load_bytes = resident_bytes() - before
+        self.loads += 1
+        metrics.incr("model.loads", model=self.name)
+        logger.info(
+            "Loaded %s model in %.1fs, resident memory up by %.1f MB",
+            self.name, self.last_load_seconds, self.last_load_bytes / (1024 * 1024),
+        )
+
+    def _schedule_eviction(self, delay: float) -> None:
+        if self.idle_seconds <= 0 or self._timer is not None:
+            return
+        self._timer = threading.Timer(delay, self._check_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _check_idle(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._model is None:
+                return
+            idle = time.monotonic() - self._last_used
+            if idle < self.idle_seconds:
+                self._schedule_eviction(self.idle_seconds - idle)
+                return
+            self.evict()
+
+
+def _empty_device_cache() -> None:
+    try:  # pragma: no cover - optional dependency
+        import torch
+    except Exception:
+        return
+    cuda = getattr(torch, "cuda", None)
+    if cuda is not None and cuda.is_available():
+        cuda.empty_cache()
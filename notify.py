@@ -1,7 +1,12 @@
 """Notification utilities."""
 
+import logging
 import os
-from discord_webhook import DiscordWebhook
+
+import http_client
+import metrics
+
+logger = logging.getLogger(__name__)
 
 
 def send_discord_notification(message: str):
@@ -11,7 +16,7 @@ def send_discord_notification(message: str):
     """
     from signals import load_config
 
-    print("Preparing to send Discord notification")
+    logger.debug("Preparing to send Discord notification")
     config = load_config()
     webhook_url = config.get("discord_webhook_url")
 
@@ -19,13 +24,18 @@ def send_discord_notification(message: str):
         webhook_url = os.environ.get("STOCK_SIGNAL_WEBHOOK")
 
     if not webhook_url or "YOUR_DISCORD_WEBHOOK_URL" in webhook_url:
-        print("Discord webhook URL not configured")
+        logger.warning("Discord webhook URL not configured")
+        metrics.incr("notify.skipped")
         return
     try:
-        print("Sending Discord notification")
-        webhook = DiscordWebhook(url=webhook_url, content=message)
-        response = webhook.execute()
-        if response.status_code != 200:
-            print(f"Failed to send notification: {response.status_code}")
+        logger.info("Sending Discord notification")
+        with metrics.span("notify.discord"):
+            response = http_client.post(webhook_url, json={"content": message})
+        if response.status_code not in (200, 204):
+            metrics.incr("notify.failures", status=response.status_code)
+            logger.error("Failed to send notification: %s", response.status_code)
+        else:
+            metrics.incr("notify.sent")
     except Exception as exc:
-        print(f"Error sending notification: {exc}")
+        metrics.incr("notify.failures", status="error")
+        logger.error("Error sending notification: %s", exc)
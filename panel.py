@@ -0,0 +1,403 @@
+"""Memory-mapped columnar price panel for large ticker universes.
+
+A panel lives in ``<root>/<interval>/`` and contains:
+
+``meta.json``
+    Tickers, fields, the number of stored bars (``length``) and the allocated
+    ``capacity``.
+``timestamps.i8``
+    One int64 nanosecond timestamp per bar shared by every ticker.
+``<field>.f32``
+    A float32 matrix of shape ``(len(tickers), capacity)`` per OHLCV field.
+
+Rows are ticker-major so the history of one ticker is a contiguous slice that
+can be returned as a view of the mapping without copying. Panels opened with
+``mode="r"`` are read-only mappings, so any number of worker processes share
+the same physical pages through the OS page cache. New bars are written in
+place; the files are only rewritten when ``capacity`` is exhausted or tickers
+are added. Rewritten files are renamed over the old ones before
+``meta.json`` is updated, so processes that already mapped the panel keep a
+consistent view of the previous files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("Open", "High", "Low", "Close", "Adj Close", "Volume")
+DEFAULT_CAPACITY = 4096
+OPEN_ATTEMPTS = 5
+
+_shared: Dict[Tuple[str, str], Tuple[Tuple[int, int, int], "PricePanel"]] = {}
+_shared_lock = threading.Lock()
+
+
+def _field_file(field: str) -> str:
+    return field.replace(" ", "_") + ".f32"
+
+
+class PricePanel:
+    """Aligned float32 OHLCV storage backed by ``numpy.memmap``."""
+
+    def __init__(self, path: Path, mode: str = "r") -> None:
+        if mode not in ("r", "r+"):
+            raise ValueError(f"unsupported mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        for _ in range(OPEN_ATTEMPTS):
+            meta = json.loads((self.path / "meta.json").read_text())
+            self.tickers: List[str] = meta["tickers"]
+            self.fields: List[str] = meta["fields"]
+            self.length: int = meta["length"]
+            self.capacity: int = meta["capacity"]
+            self._index = {t: i for i, t in enumerate(self.tickers)}
+            # A writer may have swapped in reallocated files between reading
+            # meta.json and mapping them; re-read the meta in that case.
+            try:
+                self._map()
+            except ValueError:
+                continue
+            if self._sizes_match():
+                return
+        raise RuntimeError(f"panel at {self.path} changed while it was being opened")
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def create(
+        cls,
+        root: Path,
+        interval: str,
+        tickers: Sequence[str],
+        *,
+        fields: Sequence[str] = FIELDS,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> "PricePanel":
+        """Create an empty panel for ``tickers`` and open it for writing."""
+        path = Path(root) / interval
+        path.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "tickers": list(tickers),
+            "fields": list(fields),
+            "length": 0,
+            "capacity": int(capacity),
+        }
+        np.memmap(path / "timestamps.i8", dtype=np.int64, mode="w+", shape=(capacity,)).flush()
+        for field in fields:
+            arr = np.memmap(
+                path / _field_file(field),
+                dtype=np.float32,
+                mode="w+",
+                shape=(len(tickers), capacity),
+            )
+            arr[:] = np.nan
+            arr.flush()
+        _write_meta(path, meta)
+        return cls(path, mode="r+")
+
+    @classmethod
+    def open(cls, root: Path, interval: str, mode: str = "r") -> "PricePanel":
+        return cls(Path(root) / interval, mode=mode)
+
+    @staticmethod
+    def exists(root: Path, interval: str) -> bool:
+        return (Path(root) / interval / "meta.json").exists()
+
+    def _map(self) -> None:
+        self._timestamps = np.memmap(
+            self.path / "timestamps.i8", dtype=np.int64, mode=self.mode, shape=(self.capacity,)
+        )
+        self._columns: Dict[str, np.memmap] = {
+            field: np.memmap(
+                self.path / _field_file(field),
+                dtype=np.float32,
+                mode=self.mode,
+                shape=(len(self.tickers), self.capacity),
+            )
+            for field in self.fields
+        }
+
+    def _sizes_match(self) -> bool:
+        expected = {"timestamps.i8": self.capacity * 8}
+        for field in self.fields:
+            expected[_field_file(field)] = len(self.tickers) * self.capacity * 4
+        return all(
+            os.path.getsize(self.path / name) == size for name, size in expected.items()
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Stored bar timestamps as ``datetime64[ns]`` (a view, not a copy)."""
+        return self._timestamps[: self.length].view("datetime64[ns]")
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._index
+
+    def column(self, ticker: str, field: str, start: int = 0) -> np.ndarray:
+        """Return a zero-copy view of ``field`` for ``ticker`` from bar ``start``."""
+        return self._columns[field][self._index[ticker], start : self.length]
+
+    def frame(self, ticker: str, bars: Optional[int] = None) -> pd.DataFrame:
+        """Return the last ``bars`` rows for ``ticker`` as a DataFrame.
+
+        Columns are built from views of the mapping with ``copy=False``; leading
+        bars before the ticker's first observation are dropped.
+        """
+        start = 0 if bars is None else max(self.length - bars, 0)
+        close = self.column(ticker, "Close", start)
+        valid = np.flatnonzero(~np.isnan(close))
+        if valid.size == 0:
+            return pd.DataFrame()
+        start += int(valid[0])
+        index = pd.DatetimeIndex(self.timestamps[start:], name="Date")
+        data = {field: self.column(ticker, field, start) for field in self.fields}
+        return pd.DataFrame(data, index=index, copy=False)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, timestamps: Sequence, values: Dict[str, np.ndarray]) -> int:
+        """Append bars in place.
+
+        ``timestamps`` must be strictly increasing and later than the last
+        stored bar. ``values`` maps each field to an array of shape
+        ``(len(timestamps), len(tickers))``; missing fields are stored as NaN.
+        Returns the number of bars written.
+        """
+        if self.mode != "r+":
+            raise ValueError("panel opened read-only")
+        ts = pd.DatetimeIndex(timestamps).asi8
+        n = len(ts)
+        if n == 0:
+            return 0
+        if np.any(np.diff(ts) <= 0):
+            raise ValueError("timestamps must be strictly increasing")
+        if self.length and ts[0] <= self._timestamps[self.length - 1]:
+            raise ValueError("timestamps must be later than the last stored bar")
+        if self.length + n > self.capacity:
+            self._reallocate(self.tickers, max(self.capacity * 2, self.length + n))
+
+        end = self.length + n
+        self._timestamps[self.length : end] = ts
+        for field, column in self._columns.items():
+            if field in values:
+                block = np.asarray(values[field], dtype=np.float32)
+                if block.shape != (n, len(self.tickers)):
+                    raise ValueError(
+                        f"{field} has shape {block.shape}, expected {(n, len(self.tickers))}"
+                    )
+                column[:, self.length : end] = block.T
+            else:
+                column[:, self.length : end] = np.nan
+        self.length = end
+        self.flush()
+        return n
+
+    def append_frames(self, frames: Dict[str, pd.DataFrame]) -> int:
+        """Align per-ticker frames on a shared index and append new bars.
+
+        The last stored bar is overwritten in place with the incoming values,
+        since it may have been stored before it was final (today's daily bar
+        during market hours). Rows later than it are appended; tickers missing
+        a new bar get NaN for it. Unknown tickers are ignored. Returns the
+        number of bars appended.
+        """
+        last = int(self._timestamps[self.length - 1]) if self.length else None
+        if last is not None:
+            self.fill_frames(frames, since=last)
+        indexes = []
+        for ticker, df in frames.items():
+            if ticker in self._index and df is not None and not df.empty:
+                indexes.append(pd.DatetimeIndex(df.index))
+        if not indexes:
+            return 0
+        index = indexes[0]
+        for other in indexes[1:]:
+            index = index.union(other)
+        index = index.sort_values()
+        if last is not None:
+            index = index[index.asi8 > last]
+        if len(index) == 0:
+            return 0
+
+        values = {
+            field: np.full((len(index), len(self.tickers)), np.nan, dtype=np.float32)
+            for field in self.fields
+        }
+        for ticker, df in frames.items():
+            col = self._index.get(ticker)
+            if col is None or df is None or df.empty:
+                continue
+            aligned = _flatten_columns(df).reindex(index)
+            for field in self.fields:
+                if field in aligned:
+                    values[field][:, col] = aligned[field].to_numpy(dtype=np.float32)
+        return self.append(index, values)
+
+    def add_tickers(self, tickers: Iterable[str]) -> List[str]:
+        """Add rows for ``tickers`` not yet in the panel and return them.
+
+        Their stored bars are NaN until filled with :meth:`fill_frames`.
+        """
+        if self.mode != "r+":
+            raise ValueError("panel opened read-only")
+        new = [t for t in dict.fromkeys(tickers) if t not in self._index]
+        if new:
+            self._reallocate([*self.tickers, *new], self.capacity)
+        return new
+
+    def fill_frames(
+        self, frames: Dict[str, pd.DataFrame], *, since: Optional[int] = None
+    ) -> int:
+        """Write ``frames`` at bars that are already stored, in place.
+
+        Used to backfill the history of tickers added with
+        :meth:`add_tickers` and to refresh the last stored bar. Rows at other
+        timestamps, or before ``since`` (int64 nanoseconds) when given, are
+        ignored. Returns the number of tickers written.
+        """
+        if self.mode != "r+":
+            raise ValueError("panel opened read-only")
+        if not self.length:
+            return 0
+        stored = np.asarray(self._timestamps[: self.length])
+        filled = 0
+        for ticker, df in frames.items():
+            row = self._index.get(ticker)
+            if row is None or df is None or df.empty:
+                continue
+            df = _flatten_columns(df)
+            ts = pd.DatetimeIndex(df.index).asi8
+            pos = np.searchsorted(stored, ts)
+            hit = pos < self.length
+            hit[hit] = stored[pos[hit]] == ts[hit]
+            if since is not None:
+                hit &= ts >= since
+            for field in self.fields:
+                if field in df:
+                    block = df[field].to_numpy(dtype=np.float32)
+                    self._columns[field][row, pos[hit]] = block[hit]
+            filled += 1
+        if filled:
+            self.flush()
+        return filled
+
+    def flush(self) -> None:
+        self._timestamps.flush()
+        for column in self._columns.values():
+            column.flush()
+        _write_meta(
+            self.path,
+            {
+                "tickers": self.tickers,
+                "fields": self.fields,
+                "length": self.length,
+                "capacity": self.capacity,
+            },
+        )
+
+    def _reallocate(self, tickers: List[str], capacity: int) -> None:
+        """Copy the panel into files for ``tickers`` and ``capacity``.
+
+        The copies are written under temporary names and renamed over the
+        live files, then ``meta.json`` is written last. Processes that already
+        mapped the panel keep the old files, so they never see rows with a
+        different stride.
+        """
+        rows = len(self.tickers)
+        staged = ["timestamps.i8", *(_field_file(field) for field in self.fields)]
+
+        ts = np.memmap(
+            self.path / "timestamps.i8.tmp", dtype=np.int64, mode="w+", shape=(capacity,)
+        )
+        ts[: self.length] = self._timestamps[: self.length]
+        ts.flush()
+        del ts
+        for field, column in self._columns.items():
+            arr = np.memmap(
+                self.path / (_field_file(field) + ".tmp"),
+                dtype=np.float32,
+                mode="w+",
+                shape=(len(tickers), capacity),
+            )
+            arr[:] = np.nan
+            arr[:rows, : self.length] = column[:, : self.length]
+            arr.flush()
+            del arr
+
+        del self._timestamps, self._columns
+        for name in staged:
+            os.replace(self.path / (name + ".tmp"), self.path / name)
+        self.tickers = list(tickers)
+        self.capacity = capacity
+        self._index = {t: i for i, t in enumerate(self.tickers)}
+        self._map()
+        self.flush()
+
+
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop the ticker level yfinance adds to single-ticker downloads."""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+
+def _write_meta(path: Path, meta: Dict) -> None:
+    tmp = path / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, path / "meta.json")
+
+
+def open_shared(root: Path, interval: str) -> Optional[PricePanel]:
+    """Return a read-only panel shared by all callers in this process.
+
+    The mapping is reused until ``meta.json`` is replaced by a writer, so a
+    run over many tickers opens the files once instead of once per ticker.
+    Returns ``None`` when no panel exists.
+    """
+    try:
+        st = os.stat(Path(root) / interval / "meta.json")
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    key = (str(root), interval)
+    with _shared_lock:
+        cached = _shared.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, PricePanel.open(root, interval))
+            _shared[key] = cached
+        return cached[1]
+
+
+def build_panel(
+    root: Path, interval: str, frames: Dict[str, pd.DataFrame], *, tickers: Iterable[str] = ()
+) -> PricePanel:
+    """Open (or create) the panel for ``interval`` and append ``frames``.
+
+    Tickers in ``tickers`` or ``frames`` that an existing panel does not hold
+    yet are added, and their frames backfill the bars already stored.
+    """
+    if PricePanel.exists(root, interval):
+        panel = PricePanel.open(root, interval, mode="r+")
+        added = panel.add_tickers([*tickers, *frames])
+        panel.fill_frames({t: frames[t] for t in added if t in frames})
+    else:
+        universe = list(dict.fromkeys([*tickers, *frames]))
+        panel = PricePanel.create(root, interval, universe)
+    panel.append_frames(frames)
+    return panel
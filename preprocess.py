@@ -0,0 +1,195 @@
+"""Pre-inference text filtering and near-duplicate collapsing.
+
+Scraped tweets are full of retweets, copy-paste bot spam and fragments that
+are empty once URLs and punctuation are stripped. :func:`prepare_texts` drops
+texts that are too short, collapses exact and near-duplicates into groups and
+returns one representative per group, so each group is scored once and
+weighted by its size.
+
+Near-duplicates are found with 64-bit SimHash fingerprints over word shingles.
+Fingerprints are split into ``max_distance + 1`` bands for LSH bucketing: any
+two fingerprints within that Hamming distance share at least one identical
+band, so only texts in a common bucket are compared.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+MIN_TOKENS = 3
+SIMHASH_DISTANCE = 3
+SHINGLE_SIZE = 2
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_RETWEET_RE = re.compile(r"^rt\s+\w+\s*")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Collapse whitespace and strip a leading ``rt <user>`` retweet marker.
+
+    ``text`` is expected to have been through :func:`scrape.clean_text`.
+    """
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return _RETWEET_RE.sub("", text)
+
+
+def simhash(tokens: List[str], shingle: int = SHINGLE_SIZE) -> int:
+    """Return a 64-bit SimHash fingerprint for ``tokens``."""
+    if len(tokens) >= shingle:
+        features = [" ".join(tokens[i : i + shingle]) for i in range(len(tokens) - shingle + 1)]
+    else:
+        features = tokens
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _bands(fingerprint: int, bands: int) -> List[Tuple[int, int]]:
+    width = 64 // bands
+    mask = (1 << width) - 1
+    return [(i, fingerprint >> (i * width) & mask) for i in range(bands)]
+
+
+class TextDeduplicator:
+    """Incrementally filter texts and assign them to duplicate groups.
+
+    Only fingerprints and hashes of already seen texts are kept, so memory
+    grows with the number of distinct texts rather than their total size.
+    """
+
+    def __init__(
+        self, *, min_tokens: int = MIN_TOKENS, max_distance: int = SIMHASH_DISTANCE
+    ) -> None:
+        self.min_tokens = min_tokens
+        self.max_distance = max_distance
+        self.groups = 0
+        self._bands = min(max_distance, 63) + 1
+        self._fingerprints: List[int] = []
+        self._exact: Dict[bytes, int] = {}
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self.stats = {
+            "input": 0,
+            "empty": 0,
+            "too_short": 0,
+            "exact_duplicates": 0,
+            "near_duplicates": 0,
+        }
+
+    def add(self, text: str) -> Tuple[Optional[int], Optional[str]]:
+        """Assign ``text`` to a group.
+
+        Returns the group index (``None`` when the text is filtered out) and
+        the normalized text when it starts a new group, else ``None``.
+        """
+        self.stats["input"] += 1
+        norm = normalize(text)
+        if not norm:
+            self.stats["empty"] += 1
+            return None, None
+        tokens = _TOKEN_RE.findall(norm)
+        if len(tokens) < self.min_tokens:
+            self.stats["too_short"] += 1
+            return None, None
+        digest = hashlib.blake2b(norm.encode("utf-8"), digest_size=16).digest()
+        if digest in self._exact:
+            self.stats["exact_duplicates"] += 1
+            return self._exact[digest], None
+
+        fingerprint = simhash(tokens)
+        group = self._near_duplicate(fingerprint)
+        if group is not None:
+            self.stats["near_duplicates"] += 1
+            self._exact[digest] = group
+            return group, None
+
+        group = self.groups
+        self.groups += 1
+        self._fingerprints.append(fingerprint)
+        self._exact[digest] = group
+        for band in _bands(fingerprint, self._bands):
+            self._buckets.setdefault(band, []).append(group)
+        return group, norm
+
+    def _near_duplicate(self, fingerprint: int) -> Optional[int]:
+        if self.max_distance <= 0:
+            return None
+        for band in _bands(fingerprint, self._bands):
+            for candidate in self._buckets.get(band, []):
+                distance = bin(self._fingerprints[candidate] ^ fingerprint).count("1")
+                if distance <= self.max_distance:
+                    return candidate
+        return None
+
+    def report(self) -> Dict[str, int]:
+        """Record the filter counts as metrics and return them."""
+        stats = {**self.stats, "unique": self.groups}
+        for name, value in stats.items():
+            metrics.incr(f"preprocess.{name}", value)
+        logger.info(
+            "Preprocessed %d texts: %d empty, %d too short, %d exact and %d near "
+            "duplicates, %d sent to the model",
+            stats["input"], stats["empty"], stats["too_short"],
+            stats["exact_duplicates"], stats["near_duplicates"], stats["unique"],
+        )
+        return stats
+
+
+def prepare_texts(
+    texts: List[str],
+    *,
+    min_tokens: int = MIN_TOKENS,
+    max_distance: int = SIMHASH_DISTANCE,
+) -> Tuple[List[str], List[Optional[int]], Dict[str, int]]:
+    """Filter ``texts`` and group exact and near-duplicates.
+
+    Parameters
+    ----------
+    texts : list of str
+        Cleaned tweet texts.
+    min_tokens : int, optional
+        Texts with fewer words are dropped. Defaults to ``3``.
+    max_distance : int, optional
+        Maximum SimHash Hamming distance treated as a near-duplicate. ``0``
+        disables near-duplicate detection. Defaults to ``3``.
+
+    Returns
+    -------
+    tuple
+        The representative text of each group, the group index assigned to
+        each input text (``None`` when it was filtered out) and filter counts.
+    """
+    dedup = TextDeduplicator(min_tokens=min_tokens, max_distance=max_distance)
+    representatives: List[str] = []
+    assignment: List[Optional[int]] = []
+    for text in texts:
+        group, new_text = dedup.add(text)
+        if new_text is not None:
+            representatives.append(new_text)
+        assignment.append(group)
+    return representatives, assignment, dedup.report()
+
+
+def group_weights(assignment: List[Optional[int]], groups: int) -> List[int]:
+    """Return how many input texts were collapsed into each group."""
+    weights = [0] * groups
+    for group in assignment:
+        if group is not None:
+            weights[group] += 1
+    return weights
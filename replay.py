@@ -0,0 +1,369 @@
+"""Record and replay external I/O for offline load testing.
+
+Every call that leaves the process (``yfinance`` downloads, scraper results
+and HTTP requests) goes through :func:`io_call` or :func:`io_stream`. The mode
+is read from ``io.mode`` in ``config.yaml`` and can be overridden with the
+``STOCK_SIGNAL_IO_MODE`` environment variable:
+
+``live``
+    Call the real service (default).
+``record``
+    Call the real service and store the result in the fixture store.
+``replay``
+    Serve stored results with optional injected latency and failures. When
+    ``io.fallback`` is enabled, calls without a recording (e.g. synthetic
+    tickers in a scaled run) get a deterministic pick among the recordings of
+    the same kind.
+
+Run ``python3 replay.py serve-webhook`` for a local stand-in for Discord and
+``python3 replay.py loadtest --scale 100`` to run ``main.main`` against the
+recordings with the ticker universe multiplied.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import yaml
+
+import metrics
+
+CONFIG_PATH = "config.yaml"
+MODE_ENV = "STOCK_SIGNAL_IO_MODE"
+MODES = ("live", "record", "replay")
+
+DEFAULTS: Dict[str, Any] = {
+    "mode": "live",
+    "fixtures": "fixtures",
+    "latency_ms": 0,
+    "jitter_ms": 0,
+    "failure_rate": 0.0,
+    "seed": 0,
+    "fallback": True,
+    "webhook_url": None,
+}
+
+logger = logging.getLogger(__name__)
+
+_settings: Optional[Dict[str, Any]] = None
+_store: Optional["FixtureStore"] = None
+_rng: Optional[random.Random] = None
+_rng_lock = threading.Lock()
+
+
+class ReplayError(ConnectionError):
+    """Failure injected in replay mode or a call missing from the fixtures."""
+
+
+def load_config() -> Dict:
+    with open(CONFIG_PATH, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def settings() -> Dict[str, Any]:
+    """Return the ``io`` config merged over :data:`DEFAULTS`."""
+    if _settings is None:
+        try:
+            configured = load_config().get("io") or {}
+        except OSError:
+            configured = {}
+        merged = {**DEFAULTS, **configured}
+        merged["mode"] = os.environ.get(MODE_ENV, merged["mode"])
+        configure(**merged)
+    return _settings
+
+
+def configure(**options) -> None:
+    """Override I/O settings for this process (e.g. from a load-test driver)."""
+    global _settings, _store, _rng
+    merged = {**DEFAULTS, **(_settings or {}), **options}
+    if merged["mode"] not in MODES:
+        raise ValueError(f"unknown io mode: {merged['mode']}")
+    _settings = merged
+    _store = FixtureStore(Path(merged["fixtures"]))
+    _rng = random.Random(merged["seed"])
+
+
+def mode() -> str:
+    return settings()["mode"]
+
+
+# ---------------------------------------------------------------------------
+# Fixture store
+# ---------------------------------------------------------------------------
+
+class FixtureStore:
+    """Pickled call results keyed by call kind and arguments."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._cache: Dict[Path, Any] = {}
+        self._listing: Dict[str, List[Path]] = {}
+
+    @staticmethod
+    def digest(key: Any) -> str:
+        payload = json.dumps(key, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+    def _path(self, kind: str, key: Any) -> Path:
+        return self.root / kind / f"{self.digest(key)}.pkl"
+
+    def save(self, kind: str, key: Any, value: Any) -> None:
+        path = self._path(kind, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump({"key": key, "value": value}, f)
+        os.replace(tmp, path)
+        self._cache.pop(path, None)
+        self._listing.pop(kind, None)
+
+    def _read(self, path: Path) -> Any:
+        if path not in self._cache:
+            with path.open("rb") as f:
+                self._cache[path] = pickle.load(f)["value"]
+        return self._cache[path]
+
+    def load(self, kind: str, key: Any, *, fallback: bool = False) -> Any:
+        """Return the recording for ``key``.
+
+        With ``fallback`` a deterministic recording of the same ``kind`` is
+        returned when ``key`` itself was never recorded.
+        """
+        path = self._path(kind, key)
+        if path.exists():
+            return self._read(path)
+        if fallback:
+            if kind not in self._listing:
+                self._listing[kind] = sorted((self.root / kind).glob("*.pkl"))
+            candidates = self._listing[kind]
+            if candidates:
+                pick = int(self.digest(key), 16) % len(candidates)
+                metrics.incr("replay.fallbacks", kind=kind)
+                return self._read(candidates[pick])
+        raise ReplayError(f"no recording for {kind} {key!r}")
+
+
+# ---------------------------------------------------------------------------
+# Call wrappers
+# ---------------------------------------------------------------------------
+
+def _inject(kind: str) -> bool:
+    """Sleep for the configured latency; return ``True`` to inject a failure."""
+    cfg = settings()
+    with _rng_lock:
+        jitter = _rng.uniform(-cfg["jitter_ms"], cfg["jitter_ms"]) if cfg["jitter_ms"] else 0
+        fail = _rng.random() < cfg["failure_rate"]
+    delay = max(cfg["latency_ms"] + jitter, 0) / 1000
+    if delay:
+        time.sleep(delay)
+    if fail:
+        metrics.incr("replay.injected_failures", kind=kind)
+    return fail
+
+
+_RAISE = object()
+
+
+def io_call(
+    kind: str,
+    key: Any,
+    func: Callable,
+    *args,
+    failure_value: Any = _RAISE,
+    **kwargs,
+) -> Any:
+    """Call ``func`` according to the current I/O mode.
+
+    ``key`` identifies the call in the fixture store. In replay mode an
+    injected failure or a missing recording raises :class:`ReplayError`, or
+    returns ``failure_value`` when given so callers see their usual failure
+    result. Replayed values are shared between calls and must not be mutated.
+    """
+    current = mode()
+    if current == "live":
+        return func(*args, **kwargs)
+    if current == "record":
+        value = func(*args, **kwargs)
+        _store.save(kind, key, value)
+        metrics.incr("replay.recorded", kind=kind)
+        return value
+
+    if _inject(kind):
+        if failure_value is _RAISE:
+            raise ReplayError(f"injected failure for {kind} {key!r}")
+        return failure_value
+    try:
+        value = _store.load(kind, key, fallback=settings()["fallback"])
+    except ReplayError:
+        metrics.incr("replay.missing", kind=kind)
+        if failure_value is _RAISE:
+            raise
+        return failure_value
+    metrics.incr("replay.served", kind=kind)
+    return value
+
+
+def io_stream(kind: str, key: Any, func: Callable, *args, **kwargs) -> Iterator:
+    """Streaming counterpart of :func:`io_call` for generator functions.
+
+    Recordings are shared with :func:`io_call` for the same ``kind`` and
+    ``key``; an injected failure ends the stream without items.
+    """
+    current = mode()
+    if current == "live":
+        yield from func(*args, **kwargs)
+        return
+    if current == "record":
+        items = []
+        for item in func(*args, **kwargs):
+            items.append(item)
+            yield item
+        _store.save(kind, key, items)
+        metrics.incr("replay.recorded", kind=kind)
+        return
+    yield from io_call(kind, key, lambda: [], failure_value=[])
+
+
+# ---------------------------------------------------------------------------
+# Stub webhook receiver
+# ---------------------------------------------------------------------------
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    received: List[Dict] = []
+    lock = threading.Lock()
+
+    def do_POST(self):  # noqa: N802 - http.server API
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            payload = {"raw": body.decode("utf-8", "replace")}
+        with self.lock:
+            self.received.append(payload)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):  # silence default stderr logging
+        logger.debug("webhook stub: " + format, *args)
+
+
+def serve_webhook(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start a local Discord stand-in on a background thread.
+
+    The server answers every POST with 204 and keeps the JSON payloads in
+    ``server.RequestHandlerClass.received``. Use ``server.server_address`` to
+    find the port when ``port`` is ``0``.
+    """
+    handler = type("WebhookHandler", (_WebhookHandler,), {"received": []})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="webhook-stub", daemon=True)
+    thread.start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Load-test driver
+# ---------------------------------------------------------------------------
+
+def scaled_tickers(tickers: List[str], scale: int) -> List[str]:
+    """Return ``tickers`` followed by synthetic symbols up to ``scale`` times as many."""
+    result = list(tickers)
+    for i in range(len(tickers) * (scale - 1)):
+        result.append(f"{tickers[i % len(tickers)]}.X{i // len(tickers) + 1}")
+    return result
+
+
+def loadtest(scale: int, **overrides) -> Dict[str, Any]:
+    """Run ``main.main`` in replay mode with the ticker universe scaled.
+
+    The ``io`` settings from ``config.yaml`` apply; ``overrides`` (e.g.
+    ``latency_ms`` or ``failure_rate``) take precedence over them.
+    """
+    from unittest.mock import patch
+
+    import main
+    import signals
+
+    server = serve_webhook()
+    url = "http://%s:%d/webhook" % server.server_address
+    settings()  # merge config.yaml before applying the overrides
+    configure(**overrides, mode="replay", webhook_url=url)
+    config = signals.load_config()
+    tickers = scaled_tickers(config.get("tickers", []), scale)
+    scaled = {**config, "tickers": tickers, "discord_webhook_url": url}
+    start = time.perf_counter()
+    try:
+        with patch.object(signals, "load_config", return_value=scaled), \
+             patch.object(main, "load_config", return_value=scaled):
+            main.main()
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - start
+    return {
+        "scale": scale,
+        "tickers": len(tickers),
+        "seconds": elapsed,
+        "tickers_per_s": len(tickers) / elapsed if elapsed else 0.0,
+        "webhooks": len(server.RequestHandlerClass.received),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record/replay utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve-webhook", help="run a local Discord stand-in")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    load = sub.add_parser("loadtest", help="replay main.main with scaled tickers")
+    load.add_argument("--scale", type=int, nargs="+", default=[10])
+    load.add_argument("--latency-ms", type=float, help="override io.latency_ms")
+    load.add_argument("--jitter-ms", type=float, help="override io.jitter_ms")
+    load.add_argument("--failure-rate", type=float, help="override io.failure_rate")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve-webhook":
+        server = serve_webhook(args.host, args.port)
+        print("Webhook stub listening on http://%s:%d/" % server.server_address)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()
+            print(f"Received {len(server.RequestHandlerClass.received)} webhook calls")
+        return 0
+
+    overrides = {
+        name: value
+        for name, value in (
+            ("latency_ms", args.latency_ms),
+            ("jitter_ms", args.jitter_ms),
+            ("failure_rate", args.failure_rate),
+        )
+        if value is not None
+    }
+    for scale in args.scale:
+        result = loadtest(scale, **overrides)
+        print(
+            f"scale {result['scale']}x: {result['tickers']} tickers in "
+            f"{result['seconds']:.2f}s ({result['tickers_per_s']:.1f}/s), "
+            f"{result['webhooks']} webhooks"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
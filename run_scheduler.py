@@ -1,50 +1,58 @@
 """Run main periodically using APScheduler."""
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timedelta
+import logging
 import time
 
-from signals import load_config
+import metrics
+from signals import load_config, parse_minutes
+from sentiment import get_manager, model_settings
 import main
 
+logger = logging.getLogger(__name__)
+
 
 def run_job():
-    print(f"Scheduler triggered at {datetime.utcnow()}")
+    logger.info("Scheduler triggered at %s", datetime.utcnow())
     main.main()
 
 
-def _parse_minutes(interval: Any) -> int:
-    """Return the number of minutes represented by ``interval``.
-
-    ``interval`` may be an int or a string like ``"15 minutes"``.  If the value
-    cannot be parsed, a default of 30 is returned.
-    """
-
-    if isinstance(interval, int):
-        return interval
-    try:
-        return int(str(interval).split()[0])
-    except (ValueError, IndexError):
-        return 30
+def preload_model():
+    logger.info("Preloading sentiment model at %s", datetime.utcnow())
+    get_manager().preload()
 
 
 def start():
-    print("Starting scheduler")
+    logger.info("Starting scheduler")
+    metrics.configure()
     config = load_config()
     interval = config.get("schedule", {}).get("every", "30 minutes")
-    minutes = _parse_minutes(interval)
+    minutes = parse_minutes(interval)
 
     scheduler = BackgroundScheduler()
     scheduler.add_job(run_job, "interval", minutes=minutes)
-    print(f"Scheduler set to run every {minutes} minutes")
+    logger.info("Scheduler set to run every %d minutes", minutes)
+
+    model_cfg = model_settings()
+    lead = float(model_cfg.get("preload_minutes") or 0)
+    if model_cfg.get("idle_minutes") and 0 < lead < minutes:
+        # Same interval, offset so the model is warm when ``run_job`` fires.
+        scheduler.add_job(
+            preload_model,
+            "interval",
+            minutes=minutes,
+            start_date=datetime.now() + timedelta(minutes=minutes - lead),
+        )
+        logger.info("Sentiment model preloads %g minutes before each run", lead)
     scheduler.start()
     try:
         while True:
             time.sleep(1)
     except (KeyboardInterrupt, SystemExit):
-        print("Scheduler shutting down")
+        logger.info("Scheduler shutting down")
         scheduler.shutdown()
+        metrics.shutdown()
 
 
 if __name__ == "__main__":
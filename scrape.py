@@ -4,28 +4,40 @@ from __future__ import annotations
 
 import csv
 import logging
+import re
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-import requests
+import http_client
+import metrics
+import replay
 
 logger = logging.getLogger(__name__)
 
+_URL_RE = re.compile(r"https?://\S+")
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9\s]")
+
 
 # ---------------------------------------------------------------------------
 # X/Twitter helpers
 # ---------------------------------------------------------------------------
 
-def fetch_with_playwright(query: str, limit: int, *, headless: bool = True) -> List[Dict[str, str]]:
-    """Scrape tweets from x.com using Playwright."""
+def iter_with_playwright(
+    query: str, limit: int, *, headless: bool = True
+) -> Iterator[Dict[str, str]]:
+    """Yield tweets from x.com search results as they are extracted.
+
+    Errors are logged and end the stream; tweets yielded before the failure
+    are kept by the caller.
+    """
     try:  # pragma: no cover - optional dependency
         from playwright.sync_api import sync_playwright
     except Exception as exc:  # pragma: no cover - import errors
         logger.error("playwright not available: %s", exc)
-        return []
+        return
 
-    tweets: List[Dict[str, str]] = []
+    seen = 0
     url = f"https://x.com/search?q={query}&src=typed_query&f=live"
     try:  # pragma: no cover - network/browser errors
         with sync_playwright() as p:
@@ -33,10 +45,10 @@ def fetch_with_playwright(query: str, limit: int, *, headless: bool = True) -> L
             page = browser.new_page()
             page.goto(url, timeout=60000)
             last_height = 0
-            while len(tweets) < limit:
+            while seen < limit:
                 page.wait_for_selector("article", timeout=30000)
                 articles = page.query_selector_all("article")
-                for article in articles[len(tweets):]:
+                for article in articles[seen:]:
                     text = article.inner_text()
                     link = article.query_selector("a[href*='/status/']")
                     time_el = article.query_selector("time")
@@ -50,15 +62,14 @@ def fetch_with_playwright(query: str, limit: int, *, headless: bool = True) -> L
                     else:
                         continue
                     date = time_el.get_attribute("datetime") or ""
-                    tweets.append(
-                        {
-                            "date": date,
-                            "tweet_id": tweet_id,
-                            "content": text,
-                            "username": username,
-                        }
-                    )
-                    if len(tweets) >= limit:
+                    seen += 1
+                    yield {
+                        "date": date,
+                        "tweet_id": tweet_id,
+                        "content": text,
+                        "username": username,
+                    }
+                    if seen >= limit:
                         break
                 page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 page.wait_for_timeout(1000)
@@ -69,8 +80,11 @@ def fetch_with_playwright(query: str, limit: int, *, headless: bool = True) -> L
             browser.close()
     except Exception as exc:
         logger.error("fetch_with_playwright failed for '%s': %s", query, exc)
-        return []
-    return tweets[:limit]
+
+
+def fetch_with_playwright(query: str, limit: int, *, headless: bool = True) -> List[Dict[str, str]]:
+    """Scrape tweets from x.com using Playwright."""
+    return list(iter_with_playwright(query, limit, headless=headless))
 
 
 def fetch_with_twint(query: str, limit: int) -> List[Dict[str, str]]:
@@ -115,10 +129,9 @@ def fetch_with_twint(query: str, limit: int) -> List[Dict[str, str]]:
 def fetch_from_nitter(query: str, limit: int, instance: str = "https://nitter.net") -> List[Dict[str, str]]:
     """Fetch tweets from a Nitter instance."""
     try:
-        resp = requests.get(
+        resp = http_client.get(
             f"{instance}/search",
             params={"f": "tweets", "q": query, "format": "json"},
-            timeout=10,
         )
         if resp.status_code != 200:
             return []
@@ -162,21 +175,38 @@ def fetch_from_nitter(query: str, limit: int, instance: str = "https://nitter.ne
 
 def clean_text(text: str) -> str:
     """Simple text cleaner."""
-    import re
-
-    text = re.sub(r"https?://\S+", "", text)
-    text = re.sub(r"[^a-zA-Z0-9\s]", "", text)
+    text = _URL_RE.sub("", text)
+    text = _NON_ALNUM_RE.sub("", text)
     return text.strip().lower()
 
 
-def append_unique_csv(file_path: Path, rows: List[Dict[str, str]], *, key_field: str, headers: List[str]) -> None:
-    """Append rows to ``file_path`` ensuring ``key_field`` uniqueness."""
+def read_csv_keys(file_path: Path, key_field: str) -> Set[str]:
+    """Return the ``key_field`` values already stored in ``file_path``."""
     existing = set()
     if file_path.exists():
         with file_path.open("r", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
                 existing.add(row.get(key_field))
+    return existing
+
+
+def append_unique_csv(
+    file_path: Path,
+    rows: List[Dict[str, str]],
+    *,
+    key_field: str,
+    headers: List[str],
+    existing: Optional[Set[str]] = None,
+) -> None:
+    """Append rows to ``file_path`` ensuring ``key_field`` uniqueness.
+
+    ``existing`` may hold the keys already in the file, as returned by
+    :func:`read_csv_keys`, to avoid re-reading it on every call; it is
+    updated with the keys written.
+    """
+    if existing is None:
+        existing = read_csv_keys(file_path, key_field)
     with file_path.open("a", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=headers)
         if f.tell() == 0:
@@ -201,51 +231,178 @@ def get_tweets(
     """Fetch recent tweets and store them in CSV files."""
     texts: List[str] = []
     for kw in keywords:
-        csv_file = Path(f"{kw.replace(' ', '_')}_tweets.csv")
-        attempt = 0
-        success = False
-        print(f"Fetching tweets for '{kw}'")
-        results: List[Dict[str, str]] = []
-        while attempt < retries:
-            print(f"Playwright attempt {attempt + 1} for '{kw}'")
-            results = fetch_with_playwright(kw, limit)
-            if results:
-                print(f"Playwright succeeded for '{kw}'")
-                success = True
-                break
-            attempt += 1
-            time.sleep(delay * (2 ** attempt))
-        if not success:
-            print(f"Falling back to Twint for '{kw}'")
-            attempt = 0
-            while attempt < retries:
-                print(f"Twint attempt {attempt + 1} for '{kw}'")
-                results = fetch_with_twint(kw, limit)
-                if results:
-                    print(f"Twint succeeded for '{kw}'")
-                    success = True
-                    break
-                attempt += 1
-                time.sleep(delay * (2 ** attempt))
-        if not success:
-            print(f"Falling back to Nitter for '{kw}'")
-            results = fetch_from_nitter(kw, limit)
-            success = bool(results)
-            if success:
-                print(f"Nitter succeeded for '{kw}'")
-
-        if success:
-            append_unique_csv(
-                csv_file,
-                results,
-                key_field="tweet_id",
-                headers=["date", "tweet_id", "content", "username"],
-            )
-            texts.extend(clean_text(r["content"]) for r in results)
-        else:
-            logger.error("all twitter methods failed for '%s'", kw)
-            print(f"Failed to fetch tweets for '{kw}'")
+        with metrics.span("scrape.keyword", keyword=kw):
+            results = _fetch_keyword(kw, limit, retries=retries, delay=delay)
+        texts.extend(clean_text(r["content"]) for r in results)
     return texts
 
 
+def tweet_key(tweet: Dict[str, str]) -> str:
+    """Return the identity used to deduplicate ``tweet`` across queries."""
+    return tweet.get("tweet_id") or tweet.get("content", "")
+
 
+def get_unique_tweets(
+    queries: List[str],
+    limit: int = 50,
+    *,
+    retries: int = 3,
+    delay: float = 1.0,
+) -> Tuple[Dict[str, Dict[str, str]], Dict[str, List[str]]]:
+    """Scrape each distinct query once and deduplicate tweets by ``tweet_id``.
+
+    Returns
+    -------
+    tuple
+        A mapping of tweet key to tweet row (content already cleaned) and a
+        mapping of query to the tweet keys it matched.
+    """
+    tweets: Dict[str, Dict[str, str]] = {}
+    keys_by_query: Dict[str, List[str]] = {}
+    fetched = 0
+    for query in dict.fromkeys(queries):
+        with metrics.span("scrape.keyword", keyword=query):
+            results = _fetch_keyword(query, limit, retries=retries, delay=delay)
+        fetched += len(results)
+        keys: List[str] = []
+        for row in results:
+            key = tweet_key(row)
+            if key not in tweets:
+                tweets[key] = {**row, "content": clean_text(row["content"])}
+            keys.append(key)
+        keys_by_query[query] = keys
+    metrics.incr("scrape.duplicates", fetched - len(tweets))
+    logger.info(
+        "Fetched %d tweets for %d queries, %d unique",
+        fetched, len(keys_by_query), len(tweets),
+    )
+    return tweets, keys_by_query
+
+
+def _fetch_keyword(
+    kw: str, limit: int, *, retries: int, delay: float
+) -> List[Dict[str, str]]:
+    """Fetch tweets for one keyword trying each scraper in turn."""
+    csv_file = Path(f"{kw.replace(' ', '_')}_tweets.csv")
+    attempt = 0
+    success = False
+    logger.info("Fetching tweets for '%s'", kw)
+    results: List[Dict[str, str]] = []
+    while attempt < retries:
+        logger.debug("Playwright attempt %d for '%s'", attempt + 1, kw)
+        with metrics.span("scrape.playwright", keyword=kw):
+            results = replay.io_call(
+                "scrape.playwright", (kw, limit), fetch_with_playwright, kw, limit,
+                failure_value=[],
+            )
+        if results:
+            logger.info("Playwright succeeded for '%s'", kw)
+            success = True
+            break
+        metrics.incr("scrape.retries", method="playwright", keyword=kw)
+        attempt += 1
+        time.sleep(delay * (2 ** attempt))
+    if not success:
+        results = _fetch_fallbacks(kw, limit, retries=retries, delay=delay)
+        success = bool(results)
+
+    if not success:
+        metrics.incr("scrape.failures", keyword=kw)
+        logger.error("all twitter methods failed for '%s'", kw)
+        return []
+    metrics.incr("scrape.tweets", len(results), keyword=kw)
+    append_unique_csv(
+        csv_file,
+        results,
+        key_field="tweet_id",
+        headers=["date", "tweet_id", "content", "username"],
+    )
+    return results
+
+
+def _fetch_fallbacks(
+    kw: str, limit: int, *, retries: int, delay: float
+) -> List[Dict[str, str]]:
+    """Try Twint with retries, then Nitter, for one keyword."""
+    logger.info("Falling back to Twint for '%s'", kw)
+    attempt = 0
+    while attempt < retries:
+        logger.debug("Twint attempt %d for '%s'", attempt + 1, kw)
+        with metrics.span("scrape.twint", keyword=kw):
+            results = replay.io_call(
+                "scrape.twint", (kw, limit), fetch_with_twint, kw, limit,
+                failure_value=[],
+            )
+        if results:
+            logger.info("Twint succeeded for '%s'", kw)
+            return results
+        metrics.incr("scrape.retries", method="twint", keyword=kw)
+        attempt += 1
+        time.sleep(delay * (2 ** attempt))
+    logger.info("Falling back to Nitter for '%s'", kw)
+    with metrics.span("scrape.nitter", keyword=kw):
+        results = fetch_from_nitter(kw, limit)
+    if results:
+        logger.info("Nitter succeeded for '%s'", kw)
+    return results
+
+
+def iter_tweets(
+    queries: List[str],
+    limit: int = 50,
+    *,
+    retries: int = 3,
+    delay: float = 1.0,
+    chunk_size: int = 100,
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Stream ``(query, tweet)`` pairs as the scrapers extract them.
+
+    Playwright results are yielded as soon as each tweet is parsed; Twint and
+    Nitter, which only return complete lists, are used as fallbacks when
+    Playwright yields nothing. Tweet content is cleaned and rows are appended
+    to the CSV cache every ``chunk_size`` tweets, so buffered rows do not grow
+    with ``limit``. The ids already in each CSV file are read once per query.
+    """
+    for query in dict.fromkeys(queries):
+        csv_file = Path(f"{query.replace(' ', '_')}_tweets.csv")
+        stored_ids = read_csv_keys(csv_file, "tweet_id")
+        pending: List[Dict[str, str]] = []
+        count = 0
+
+        def flush() -> None:
+            if pending:
+                append_unique_csv(
+                    csv_file,
+                    pending,
+                    key_field="tweet_id",
+                    headers=["date", "tweet_id", "content", "username"],
+                    existing=stored_ids,
+                )
+                pending.clear()
+
+        with metrics.span("scrape.stream", keyword=query):
+            for attempt in range(retries):
+                for row in replay.io_stream(
+                    "scrape.playwright", (query, limit), iter_with_playwright, query, limit
+                ):
+                    count += 1
+                    pending.append(row)
+                    if len(pending) >= chunk_size:
+                        flush()
+                    yield query, {**row, "content": clean_text(row["content"])}
+                if count:
+                    break
+                metrics.incr("scrape.retries", method="playwright", keyword=query)
+                time.sleep(delay * (2 ** (attempt + 1)))
+            if not count:
+                rows = _fetch_fallbacks(query, limit, retries=retries, delay=delay)
+                for row in rows:
+                    count += 1
+                    pending.append(row)
+                    yield query, {**row, "content": clean_text(row["content"])}
+            flush()
+        if count:
+            metrics.incr("scrape.tweets", count, keyword=query)
+        else:
+            metrics.incr("scrape.failures", keyword=query)
+            logger.error("all twitter methods failed for '%s'", query)
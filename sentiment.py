@@ -1,44 +1,244 @@
 """Sentiment analysis module using a quantized model."""
 
-from typing import List
+import logging
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from transformers import (
     AutoModelForSequenceClassification,
     AutoTokenizer,
     pipeline,
 )
 import torch
+import yaml
+
+import metrics
+from model_manager import ModelManager
+from preprocess import TextDeduplicator, group_weights, prepare_texts
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = "config.yaml"
+MODEL_DEFAULTS: Dict[str, Any] = {
+    "name": "mistralai/Mistral-7B-Instruct-v0.2",
+    "dtype": "auto",
+    "low_cpu_mem_usage": True,
+    "use_safetensors": True,
+    "idle_minutes": 10,
+    "preload_minutes": 2,
+}
 
 _pipeline = None
+_manager: Optional[ModelManager] = None
+_manager_lock = threading.Lock()
+_DONE = object()
+_PUT_TIMEOUT = 0.1
+
+
+def model_settings() -> Dict[str, Any]:
+    """Return the ``model`` config section merged over :data:`MODEL_DEFAULTS`."""
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            configured = (yaml.safe_load(f) or {}).get("model") or {}
+    except OSError:
+        configured = {}
+    return {**MODEL_DEFAULTS, **configured}
+
+
+def _build_pipeline():
+    """Load the sentiment model with memory-mapped, low-memory weight loading.
+
+    ``low_cpu_mem_usage`` loads weights straight from the memory-mapped
+    safetensors files instead of materialising a randomly initialised model
+    first, which roughly halves peak memory during load.
+    """
+    cfg = model_settings()
+    dtype = cfg["dtype"]
+    if dtype != "auto":
+        dtype = getattr(torch, dtype)
+    tokenizer = AutoTokenizer.from_pretrained(cfg["name"])
+    model = AutoModelForSequenceClassification.from_pretrained(
+        cfg["name"],
+        low_cpu_mem_usage=cfg["low_cpu_mem_usage"],
+        use_safetensors=cfg["use_safetensors"],
+        torch_dtype=dtype,
+    )
+    return pipeline(
+        "sentiment-analysis",
+        model=model,
+        tokenizer=tokenizer,
+        device=0 if torch.cuda.is_available() else -1,
+    )
+
+
+def get_manager() -> ModelManager:
+    """Return the process-wide manager for the sentiment pipeline."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                idle = float(model_settings()["idle_minutes"]) * 60
+                _manager = ModelManager(_build_pipeline, idle_seconds=idle, name="sentiment")
+    return _manager
 
 
 def _load_pipeline():
-    """Load the quantized Mistral 7B INT4 model."""
-    global _pipeline
-    if _pipeline is None:
-        print("Loading sentiment model")
-        model_name = "mistralai/Mistral-7B-Instruct-v0.2"
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForSequenceClassification.from_pretrained(model_name)
-        _pipeline = pipeline(
-            "sentiment-analysis",
-            model=model,
-            tokenizer=tokenizer,
-            device=0 if torch.cuda.is_available() else -1,
-        )
-    return _pipeline
-
-
-def compute_sentiment(texts: List[str]) -> float:
-    """Compute average sentiment score for a list of texts."""
+    """Return the sentiment pipeline.
+
+    An explicitly assigned ``_pipeline`` (e.g. a stand-in classifier) takes
+    precedence; otherwise the pipeline comes from :func:`get_manager`, which
+    loads it on demand and unloads it when idle.
+    """
+    if _pipeline is not None:
+        return _pipeline
+    return get_manager().get()
+
+
+def score_texts(texts: List[str]) -> List[float]:
+    """Return a signed sentiment score in ``[-1, 1]`` for each text."""
     if not texts:
-        return 0.0
+        return []
     sentiment_pipe = _load_pipeline()
-    results = sentiment_pipe(texts)
+    with metrics.span("sentiment.inference"):
+        results = sentiment_pipe(texts)
+    metrics.incr("sentiment.texts_scored", len(texts))
     scores = []
     for res in results:
         label = res["label"].lower()
         score = res["score"] if label == "positive" else -res["score"]
         scores.append(score)
-    avg = float(sum(scores) / len(scores))
-    print(f"Computed sentiment: {avg}")
+    return scores
+
+
+def compute_sentiment(texts: List[str], **preprocess_options) -> float:
+    """Compute average sentiment score for a list of texts.
+
+    Texts are filtered and deduplicated with :func:`preprocess.prepare_texts`
+    first; each group is scored once and weighted by its size.
+    """
+    groups, assignment, _ = prepare_texts(texts, **preprocess_options)
+    if not groups:
+        return 0.0
+    scores = score_texts(groups)
+    weights = group_weights(assignment, len(groups))
+    avg = float(sum(s * w for s, w in zip(scores, weights)) / sum(weights))
+    logger.info("Computed sentiment: %s", avg)
     return avg
+
+
+class RunningMean:
+    """Incrementally updated weighted mean."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.weight = 0.0
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self.total += value * weight
+        self.weight += weight
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.weight if self.weight else 0.0
+
+
+def stream_scores(
+    items: Iterable[Tuple[Any, str]],
+    *,
+    batch_size: int = 16,
+    queue_size: int = 64,
+    **preprocess_options,
+) -> Iterator[Tuple[Any, float]]:
+    """Score a stream of ``(tag, text)`` pairs while it is still being produced.
+
+    ``items`` is consumed on a background thread and handed over through a
+    queue bounded by ``queue_size``, so scraping continues while a batch is
+    being scored. Texts are deduplicated with
+    :class:`preprocess.TextDeduplicator`; each new group is scored once in
+    batches of ``batch_size`` and ``(tag, score)`` is yielded for every input
+    that was not filtered out.
+    """
+    handoff: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    errors: List[BaseException] = []
+    stop = threading.Event()
+
+    def offer(item: Any) -> bool:
+        # Give up once the consumer has stopped instead of blocking forever.
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        source = iter(items)
+        try:
+            for item in source:
+                if not offer(item):
+                    break
+        except BaseException as exc:  # surfaced in the consumer
+            errors.append(exc)
+        finally:
+            # Close the source generator here so scrapers release browsers
+            # and connections even when the consumer stopped early.
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+            offer(_DONE)
+
+    producer = threading.Thread(target=produce, name="sentiment-producer", daemon=True)
+    producer.start()
+
+    dedup = TextDeduplicator(**preprocess_options)
+    scores: Dict[int, float] = {}
+    waiting: Dict[int, List[Any]] = {}
+    batch_groups: List[int] = []
+    batch_texts: List[str] = []
+
+    def score_batch() -> Iterator[Tuple[Any, float]]:
+        with metrics.span("sentiment.stream_batch"):
+            batch_scores = score_texts(batch_texts)
+        for group, score in zip(batch_groups, batch_scores):
+            scores[group] = score
+            for tag in waiting.pop(group):
+                yield tag, score
+        batch_groups.clear()
+        batch_texts.clear()
+
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                break
+            tag, text = item
+            group, new_text = dedup.add(text)
+            if group is None:
+                continue
+            if group in scores:
+                yield tag, scores[group]
+                continue
+            waiting.setdefault(group, []).append(tag)
+            if new_text is not None:
+                batch_groups.append(group)
+                batch_texts.append(new_text)
+                if len(batch_texts) >= batch_size:
+                    yield from score_batch()
+        if batch_texts:
+            yield from score_batch()
+    finally:
+        stop.set()
+        producer.join()
+    dedup.report()
+    if errors:
+        raise errors[0]
+
+
+def stream_sentiment(texts: Iterable[str], **options) -> float:
+    """Streaming counterpart of :func:`compute_sentiment`."""
+    running = RunningMean()
+    for _, score in stream_scores(((None, t) for t in texts), **options):
+        running.add(score)
+    logger.info("Computed streaming sentiment: %s", running.mean)
+    return running.mean
@@ -1,52 +1,269 @@
 """Generate trading signals."""
 
-from typing import Dict
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+import pandas as pd
 import yaml
-from data import fetch_price
-from scrape import get_tweets
-from sentiment import compute_sentiment
+import metrics
+from data import load_price
+from scrape import get_unique_tweets, iter_tweets, tweet_key
+from sentiment import RunningMean, score_texts, stream_scores
+from preprocess import prepare_texts
 from indicators import compute_rsi, compute_sma, compute_macd
 
 CONFIG_PATH = "config.yaml"
 
+logger = logging.getLogger(__name__)
+
 
 def load_config() -> Dict:
     with open(CONFIG_PATH, "r") as f:
         return yaml.safe_load(f)
 
 
-def generate_signal(ticker: str) -> str:
-    """Generate trading signal for a ticker."""
-    config = load_config()
-    df = fetch_price(ticker)
-    rsi = compute_rsi(df)
-    sma_short = compute_sma(df, 50)
-    sma_long = compute_sma(df, 200)
-    macd_val = compute_macd(df)
-    print(
-        f"Indicators for {ticker}: RSI={rsi}, SMA50={sma_short}, "
-        f"SMA200={sma_long}, MACD={macd_val}"
+def parse_minutes(interval: Any) -> int:
+    """Return the number of minutes represented by ``interval``.
+
+    ``interval`` may be an int or a string like ``"15 minutes"``.  If the value
+    cannot be parsed, a default of 30 is returned.
+    """
+
+    if isinstance(interval, int):
+        return interval
+    try:
+        return int(str(interval).split()[0])
+    except (ValueError, IndexError):
+        return 30
+
+
+def evaluate_signal(
+    ticker: str,
+    df: Optional[pd.DataFrame] = None,
+    sentiment_score: Optional[float] = None,
+) -> Dict:
+    """Evaluate the signal rules for ``ticker`` and return the inputs used.
+
+    The returned dict holds ``signal`` alongside the indicator values and the
+    sentiment score so callers can persist or display them. Pass
+    ``sentiment_score`` when it was already computed for several tickers at
+    once with :func:`ticker_sentiments`; otherwise it is scraped and scored
+    for ``ticker`` alone.
+    """
+    with metrics.span("signals.evaluate", ticker=ticker):
+        return _evaluate(ticker, df, sentiment_score)
+
+
+def ticker_queries(ticker: str, config: Dict) -> List[str]:
+    """Return the search queries used for ``ticker``'s sentiment.
+
+    Falls back to the global ``keywords`` list when ``queries`` has no entry.
+    """
+    return list((config.get("queries") or {}).get(ticker) or config.get("keywords", []))
+
+
+def ticker_sentiments(tickers: List[str], config: Dict) -> Dict[str, float]:
+    """Score sentiment for several tickers with one scrape and inference pass.
+
+    The union of all query sets is scraped once, tweets are deduplicated by
+    id and by (near-)identical text, each remaining text is scored exactly once
+    and the scores are then averaged per ticker over the tweets matched by that
+    ticker's queries.
+    """
+    query_sets = {t: ticker_queries(t, config) for t in tickers}
+    if (config.get("streaming") or {}).get("enabled"):
+        return _stream_ticker_sentiments(query_sets, config)
+    union = [q for queries in query_sets.values() for q in queries]
+    with metrics.span("signals.sentiment.scrape"):
+        tweets, keys_by_query = get_unique_tweets(union)
+    keys = list(tweets)
+    groups, assignment, _ = prepare_texts(
+        [tweets[k]["content"] for k in keys], **(config.get("preprocess") or {})
+    )
+    with metrics.span("signals.sentiment.score"):
+        group_scores = score_texts(groups)
+    scores = {
+        k: group_scores[g] for k, g in zip(keys, assignment) if g is not None
+    }
+
+    results: Dict[str, float] = {}
+    for ticker, queries in query_sets.items():
+        matched = {k for q in queries for k in keys_by_query.get(q, [])}
+        values = [scores[k] for k in matched if k in scores]
+        results[ticker] = float(sum(values) / len(values)) if values else 0.0
+        logger.info(
+            "Sentiment score for %s: %s (%d tweets)", ticker, results[ticker], len(values)
+        )
+    return results
+
+
+def _stream_ticker_sentiments(
+    query_sets: Dict[str, List[str]], config: Dict
+) -> Dict[str, float]:
+    """Streaming variant of :func:`ticker_sentiments`.
+
+    Tweets flow from the scrapers into batched inference as they are
+    extracted and are folded into per-ticker running means.
+    """
+    stream_cfg = config.get("streaming") or {}
+    tickers_by_query: Dict[str, List[str]] = {}
+    for ticker, queries in query_sets.items():
+        for query in queries:
+            tickers_by_query.setdefault(query, []).append(ticker)
+    means = {t: RunningMean() for t in query_sets}
+    seen: Set[Tuple[str, str]] = set()
+
+    items = (
+        ((query, tweet_key(tweet)), tweet["content"])
+        for query, tweet in iter_tweets(list(tickers_by_query))
+    )
+    with metrics.span("signals.sentiment.stream"):
+        for (query, key), score in stream_scores(
+            items,
+            batch_size=stream_cfg.get("batch_size", 16),
+            queue_size=stream_cfg.get("queue_size", 64),
+            **(config.get("preprocess") or {}),
+        ):
+            for ticker in tickers_by_query[query]:
+                if (ticker, key) not in seen:
+                    seen.add((ticker, key))
+                    means[ticker].add(score)
+
+    results = {t: float(m.mean) for t, m in means.items()}
+    for ticker, value in results.items():
+        logger.info(
+            "Sentiment score for %s: %s (%d tweets)", ticker, value, int(means[ticker].weight)
+        )
+    return results
+
+
+def compute_indicators(ticker: str, df: pd.DataFrame) -> Dict:
+    """Return the technical inputs of the signal rules for ``df``."""
+    with metrics.span("signals.indicators", ticker=ticker):
+        values = {
+            "ticker": ticker,
+            "rsi": compute_rsi(df),
+            "sma50": compute_sma(df, 50),
+            "sma200": compute_sma(df, 200),
+            "macd": compute_macd(df),
+            "price_time": str(df.index[-1]) if not df.empty else None,
+        }
+    logger.info(
+        "Indicators for %s: RSI=%s, SMA50=%s, SMA200=%s, MACD=%s",
+        ticker, values["rsi"], values["sma50"], values["sma200"], values["macd"],
     )
+    return values
 
-    tweets = get_tweets(config.get("keywords", []))
-    sentiment_score = compute_sentiment(tweets)
-    print(f"Sentiment score for {ticker}: {sentiment_score}")
 
+def technical_sides(values: Dict, config: Dict) -> Set[str]:
+    """Return the signals still reachable given only the technical conditions.
+
+    An empty set means the ticker is a HOLD whatever the sentiment score.
+    """
+    sides = set()
     if (
-        rsi < config["thresholds"]["rsi"]["buy"]
-        and sentiment_score > config["thresholds"]["sentiment"]["buy"]
-        and sma_short > sma_long
-        and macd_val > 0
+        values["rsi"] < config["thresholds"]["rsi"]["buy"]
+        and values["sma50"] > values["sma200"]
+        and values["macd"] > 0
     ):
-        print(f"Signal for {ticker}: BUY")
-        return "BUY"
+        sides.add("BUY")
     if (
-        rsi > config["thresholds"]["rsi"]["sell"]
-        and sentiment_score < config["thresholds"]["sentiment"]["sell"]
-        and sma_short < sma_long
-        and macd_val < 0
+        values["rsi"] > config["thresholds"]["rsi"]["sell"]
+        and values["sma50"] < values["sma200"]
+        and values["macd"] < 0
     ):
-        print(f"Signal for {ticker}: SELL")
+        sides.add("SELL")
+    return sides
+
+
+def decide_signal(values: Dict, sentiment_score: Optional[float], config: Dict) -> str:
+    """Apply the sentiment half of the rules to the reachable technical sides."""
+    sides = technical_sides(values, config)
+    if sentiment_score is None:
+        return "HOLD"
+    if "BUY" in sides and sentiment_score > config["thresholds"]["sentiment"]["buy"]:
+        return "BUY"
+    if "SELL" in sides and sentiment_score < config["thresholds"]["sentiment"]["sell"]:
         return "SELL"
-    print(f"Signal for {ticker}: HOLD")
     return "HOLD"
+
+
+def _finish(values: Dict, sentiment_score: Optional[float], config: Dict) -> Dict:
+    signal = decide_signal(values, sentiment_score, config)
+    metrics.incr("signals.generated", signal=signal)
+    logger.info("Signal for %s: %s", values["ticker"], signal)
+    return {**values, "signal": signal, "sentiment": sentiment_score}
+
+
+def _evaluate(
+    ticker: str, df: Optional[pd.DataFrame], sentiment_score: Optional[float]
+) -> Dict:
+    config = load_config()
+    if df is None:
+        df = load_price(ticker, config)
+    values = compute_indicators(ticker, df)
+
+    if sentiment_score is None:
+        with metrics.span("signals.sentiment", ticker=ticker):
+            sentiment_score = ticker_sentiments([ticker], config)[ticker]
+    return _finish(values, sentiment_score, config)
+
+
+def screen_universe(tickers: List[str]) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+    """Evaluate ``tickers`` in two stages, scoring sentiment only when needed.
+
+    Stage one computes indicators for every ticker and keeps those whose
+    technical conditions still allow a BUY or SELL. Stage two scrapes and
+    scores sentiment for the remaining candidates only, in a single pass over
+    their queries; every other ticker is a HOLD with ``sentiment`` set to
+    ``None``.
+
+    Returns
+    -------
+    tuple
+        Results keyed by ticker (same shape as :func:`evaluate_signal`) and
+        per-stage counts.
+    """
+    config = load_config()
+    technicals: Dict[str, Dict] = {}
+    candidates: List[str] = []
+    with metrics.span("signals.screen.technical"):
+        for ticker in tickers:
+            values = compute_indicators(ticker, load_price(ticker, config))
+            technicals[ticker] = values
+            if technical_sides(values, config):
+                candidates.append(ticker)
+
+    sentiments: Dict[str, float] = {}
+    if candidates:
+        with metrics.span("signals.screen.sentiment"):
+            sentiments = ticker_sentiments(candidates, config)
+
+    results = {}
+    for ticker, values in technicals.items():
+        results[ticker] = _finish(values, sentiments.get(ticker), config)
+
+    stats = {
+        "universe": len(tickers),
+        "technical_candidates": len(candidates),
+        "pruned": len(tickers) - len(candidates),
+        "queries_scraped": len(
+            {q for t in candidates for q in ticker_queries(t, config)}
+        ),
+    }
+    for name, value in stats.items():
+        metrics.incr(f"signals.screen.{name}", value)
+    logger.info(
+        "Screened %d tickers: %d technical candidates, %d pruned before sentiment",
+        stats["universe"], stats["technical_candidates"], stats["pruned"],
+    )
+    return results, stats
+
+
+def generate_signal(ticker: str, df: Optional[pd.DataFrame] = None) -> str:
+    """Generate trading signal for a ticker.
+
+    ``df`` may be supplied to reuse an already fetched price frame.
+    """
+    return evaluate_signal(ticker, df)["signal"]
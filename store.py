@@ -0,0 +1,100 @@
+"""Local SQLite store for computed signal results."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DB_PATH = Path("data/signals.db")
+
+_COLUMNS = [
+    "ticker",
+    "signal",
+    "rsi",
+    "sma50",
+    "sma200",
+    "macd",
+    "sentiment",
+    "price_time",
+    "computed_at",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker TEXT NOT NULL,
+    signal TEXT NOT NULL,
+    rsi REAL,
+    sma50 REAL,
+    sma200 REAL,
+    macd REAL,
+    sentiment REAL,
+    price_time TEXT,
+    computed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_signals_ticker_time
+    ON signals (ticker, computed_at);
+"""
+
+
+def _connect(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    path = Path(db_path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def save_result(result: Dict, *, db_path: Optional[Path] = None) -> None:
+    """Append a signal ``result`` to the store.
+
+    ``result`` uses the keys returned by :func:`signals.evaluate_signal`. A
+    ``computed_at`` timestamp is added when missing.
+    """
+    row = {col: result.get(col) for col in _COLUMNS}
+    if row["computed_at"] is None:
+        row["computed_at"] = datetime.utcnow().isoformat()
+    placeholders = ", ".join("?" for _ in _COLUMNS)
+    with _connect(db_path) as conn:
+        conn.execute(
+            f"INSERT INTO signals ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+            [row[col] for col in _COLUMNS],
+        )
+    conn.close()
+
+
+def latest_results(*, db_path: Optional[Path] = None) -> Dict[str, Dict]:
+    """Return the most recent stored result for every ticker."""
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT s.* FROM signals s
+            JOIN (
+                SELECT ticker, MAX(id) AS id FROM signals GROUP BY ticker
+            ) latest ON s.id = latest.id
+            ORDER BY s.ticker
+            """
+        ).fetchall()
+    conn.close()
+    return {row["ticker"]: {col: row[col] for col in _COLUMNS} for row in rows}
+
+
+def history(
+    ticker: str,
+    *,
+    limit: Optional[int] = None,
+    db_path: Optional[Path] = None,
+) -> List[Dict]:
+    """Return stored results for ``ticker`` ordered from oldest to newest."""
+    query = "SELECT * FROM signals WHERE ticker = ? ORDER BY id DESC"
+    params: list = [ticker]
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    with _connect(db_path) as conn:
+        rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return [{col: row[col] for col in _COLUMNS} for row in reversed(rows)]
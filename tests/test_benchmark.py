@@ -0,0 +1,42 @@
+import unittest
+
+import benchmark
+
+
+class TestBenchmarkHelpers(unittest.TestCase):
+    def test_percentile_interpolates(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        self.assertEqual(benchmark.percentile(values, 0), 1.0)
+        self.assertEqual(benchmark.percentile(values, 100), 4.0)
+        self.assertAlmostEqual(benchmark.percentile(values, 50), 2.5)
+        self.assertEqual(benchmark.percentile([], 95), 0.0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"10": {"fetch_price": {"p50_ms": 10.0}, "main": {"p50_ms": 100.0}}}}
+        current = {"results": {"10": {"fetch_price": {"p50_ms": 15.0}, "main": {"p50_ms": 105.0}}}}
+        regressions = benchmark.compare_results(current, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("fetch_price", regressions[0])
+
+    def test_measure_times_without_tracemalloc(self):
+        import tracemalloc
+
+        tracing = []
+
+        def call(n):
+            tracing.append(tracemalloc.is_tracing())
+            return bytearray(n)
+
+        stats = benchmark.measure(call, [(1024,), (2048,)])
+        self.assertEqual(tracing, [False, False, True, True])
+        self.assertEqual(stats["calls"], 2)
+        self.assertGreater(stats["peak_mem_mb"], 0)
+
+    def test_lexicon_classifier(self):
+        results = benchmark.LexiconClassifier()(["bullish breakout", "weak crash"])
+        self.assertEqual(results[0]["label"], "POSITIVE")
+        self.assertEqual(results[1]["label"], "NEGATIVE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import http_client
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self) -> None:
+        http_client._settings = None
+
+    def tearDown(self) -> None:
+        http_client._settings = None
+
+    def test_request_uses_shared_session_and_default_timeout(self):
+        session = MagicMock()
+        with patch('http_client.load_config', return_value={'http': {'timeout': 3}}), \
+             patch('http_client.get_session', return_value=session):
+            http_client.get('https://nitter.net/search', params={'q': 'x'})
+            http_client.post('https://discord.com/api/webhooks/1', json={}, timeout=1)
+        session.request.assert_any_call(
+            'GET', 'https://nitter.net/search', params={'q': 'x'}, timeout=3
+        )
+        session.request.assert_any_call(
+            'POST', 'https://discord.com/api/webhooks/1', json={}, timeout=1
+        )
+
+    def test_fixtures_keyed_by_host_without_full_url(self):
+        webhook = 'https://discord.com/api/webhooks/1/secret-token'
+        with patch('http_client.replay.mode', return_value='record'), \
+             patch('http_client.replay.io_call') as io_call:
+            http_client.post(webhook, json={'content': 'hi'})
+            http_client.get('https://nitter.net/search', params={'q': 'x'})
+        kinds = [call.args[0] for call in io_call.call_args_list]
+        self.assertEqual(kinds, ['http:discord.com', 'http:nitter.net'])
+        self.assertNotIn('secret-token', repr(io_call.call_args_list[0].args[1]))
+
+    def test_recorded_response_has_redacted_url(self):
+        webhook = 'https://discord.com/api/webhooks/1/secret-token'
+        response = MagicMock(url=webhook)
+        session = MagicMock()
+        session.request.return_value = response
+        with patch('http_client.get_session', return_value=session), \
+             patch('http_client.replay.mode', return_value='record'):
+            result = http_client._send_recordable('POST', webhook)
+        self.assertNotIn('secret-token', result.url)
+        self.assertIsNone(result.request)
+
+    def test_yfinance_session_can_be_disabled(self):
+        with patch('http_client.load_config', return_value={'http': {'yfinance_session': False}}), \
+             patch('http_client.get_session') as get_session:
+            self.assertIsNone(http_client.yfinance_session())
+        get_session.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
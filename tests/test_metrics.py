@@ -0,0 +1,51 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        metrics.reset()
+
+    def tearDown(self) -> None:
+        metrics.shutdown()
+        metrics.reset()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_span_and_counters_exported(self):
+        events = self.tmp / "metrics.jsonl"
+        metrics.configure(events)
+        with metrics.span("data.fetch_price", ticker="AAPL"):
+            pass
+        with self.assertRaises(ValueError):
+            with metrics.span("data.fetch_price", ticker="AAPL"):
+                raise ValueError("boom")
+        metrics.incr("sentiment.texts_scored", 3)
+        metrics.shutdown()
+
+        lines = [json.loads(line) for line in events.read_text().splitlines()]
+        self.assertEqual([e["type"] for e in lines], ["span", "span", "counter"])
+        self.assertEqual(lines[0]["tags"], {"ticker": "AAPL"})
+        self.assertEqual(lines[1]["error"], "ValueError")
+
+        prom_path = self.tmp / "metrics.prom"
+        metrics.write_prometheus(prom_path)
+        prom = prom_path.read_text()
+        self.assertIn(
+            'stock_signal_span_seconds_count{name="data.fetch_price",ticker="AAPL"} 2', prom
+        )
+        self.assertIn('stock_signal_span_errors_total{name="data.fetch_price",ticker="AAPL"} 1', prom)
+        self.assertIn('stock_signal_events_total{name="sentiment.texts_scored"} 3', prom)
+
+        table = metrics.summary_table()
+        self.assertIn("data.fetch_price", table)
+        self.assertIn("sentiment.texts_scored", table)
+
+
+if __name__ == "__main__":
+    unittest.main()
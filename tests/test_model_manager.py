@@ -0,0 +1,43 @@
+import time
+import unittest
+
+import model_manager
+
+
+class TestModelManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loads = 0
+
+    def loader(self):
+        self.loads += 1
+        return object()
+
+    def test_loads_once_and_evicts(self):
+        manager = model_manager.ModelManager(self.loader, name="test")
+        first = manager.get()
+        self.assertIs(manager.get(), first)
+        self.assertEqual(self.loads, 1)
+        self.assertTrue(manager.evict())
+        self.assertFalse(manager.loaded)
+        self.assertFalse(manager.evict())
+        manager.preload()
+        self.assertEqual(self.loads, 2)
+        stats = manager.stats()
+        self.assertEqual((stats["loads"], stats["evictions"]), (2, 1))
+        self.assertIsNotNone(stats["last_load_seconds"])
+
+    def test_idle_eviction(self):
+        manager = model_manager.ModelManager(self.loader, idle_seconds=0.05, name="test")
+        manager.get()
+        deadline = time.monotonic() + 2
+        while manager.loaded and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(manager.loaded)
+        self.assertEqual(manager.evictions, 1)
+
+    def test_resident_bytes_positive(self):
+        self.assertGreater(model_manager.resident_bytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
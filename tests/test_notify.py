@@ -1,14 +1,7 @@
 import os
-import sys
-import types
 import unittest
 from unittest.mock import patch
 
-# Dummy discord_webhook module so notify imports cleanly
-dummy_webhook = types.ModuleType("discord_webhook")
-dummy_webhook.DiscordWebhook = object
-sys.modules.setdefault("discord_webhook", dummy_webhook)
-
 import notify
 
 
@@ -20,10 +13,9 @@ class TestNotify(unittest.TestCase):
     def test_env_variable_used(self):
         with patch('signals.load_config', return_value={'discord_webhook_url': '${STOCK_SIGNAL_WEBHOOK}' }), \
              patch.dict(os.environ, {'STOCK_SIGNAL_WEBHOOK': 'https://example.com'}), \
-             patch('notify.DiscordWebhook') as mock_webhook:
-            mock_webhook.return_value.execute.return_value = DummyResponse()
+             patch('notify.http_client.post', return_value=DummyResponse()) as mock_post:
             notify.send_discord_notification('hi')
-            mock_webhook.assert_called_with(url='https://example.com', content='hi')
+            mock_post.assert_called_with('https://example.com', json={'content': 'hi'})
 
 
 if __name__ == '__main__':
@@ -0,0 +1,146 @@
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# Dummy yfinance so data imports cleanly
+sys.modules.setdefault("yfinance", types.ModuleType("yfinance"))
+
+try:
+    import numpy as np
+    import pandas as pd
+    HAVE_NUMPY = hasattr(pd, "DatetimeIndex")
+except ImportError:  # pragma: no cover - depends on environment
+    HAVE_NUMPY = False
+
+
+def _frame(start, closes):
+    index = pd.bdate_range(start, periods=len(closes), name="Date")
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": closes,
+            "Low": closes,
+            "Close": closes,
+            "Adj Close": closes,
+            "Volume": [1000] * len(closes),
+        },
+        index=index,
+    )
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy and pandas are required")
+class TestPricePanel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_append_and_read_views(self):
+        from panel import PricePanel, build_panel
+
+        frames = {
+            "AAPL": _frame("2024-01-01", [1.0, 2.0, 3.0]),
+            "MSFT": _frame("2024-01-02", [10.0, 20.0]),
+        }
+        panel = build_panel(self.root, "1d", frames)
+        self.assertEqual(panel.length, 3)
+
+        reader = PricePanel.open(self.root, "1d")
+        close = reader.column("AAPL", "Close")
+        self.assertEqual(close.dtype, np.float32)
+        self.assertIsNotNone(close.base)
+        np.testing.assert_array_equal(close, [1.0, 2.0, 3.0])
+        self.assertEqual(len(reader.frame("MSFT")), 2)
+        self.assertEqual(list(reader.frame("AAPL", bars=2)["Close"]), [2.0, 3.0])
+
+        # Overlapping bars are skipped; only new ones are appended in place.
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-01", [1.0, 2.0, 3.0, 4.0])})
+        reader = PricePanel.open(self.root, "1d")
+        self.assertEqual(reader.length, 4)
+        self.assertTrue(np.isnan(reader.column("MSFT", "Close")[-1]))
+
+    def test_last_bar_is_refreshed(self):
+        from panel import PricePanel, build_panel
+
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-01", [1.0, 2.0, 3.0])})
+        # The last bar was partial; the next download carries its final value.
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-01", [1.5, 2.5, 99.0])})
+        reader = PricePanel.open(self.root, "1d")
+        np.testing.assert_array_equal(reader.column("AAPL", "Close"), [1.0, 2.0, 99.0])
+
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-03", [100.0, 4.0])})
+        reader = PricePanel.open(self.root, "1d")
+        np.testing.assert_array_equal(reader.column("AAPL", "Close"), [1, 2, 100, 4])
+
+    def test_grows_past_capacity(self):
+        from panel import PricePanel
+
+        panel = PricePanel.create(self.root, "1d", ["AAPL"], capacity=2)
+        panel.append_frames({"AAPL": _frame("2024-01-01", [1.0, 2.0, 3.0, 4.0, 5.0])})
+        reader = PricePanel.open(self.root, "1d")
+        self.assertGreaterEqual(reader.capacity, 5)
+        np.testing.assert_array_equal(reader.column("AAPL", "Close"), [1, 2, 3, 4, 5])
+
+    def test_grow_keeps_existing_readers_consistent(self):
+        from panel import PricePanel
+
+        writer = PricePanel.create(self.root, "1d", ["AAPL", "MSFT"], capacity=2)
+        writer.append_frames({
+            "AAPL": _frame("2024-01-01", [1.0, 2.0]),
+            "MSFT": _frame("2024-01-01", [5.0, 6.0]),
+        })
+        reader = PricePanel.open(self.root, "1d")
+        writer.append_frames({"MSFT": _frame("2024-01-03", [7.0, 8.0])})
+        self.assertGreater(writer.capacity, 2)
+        np.testing.assert_array_equal(reader.column("MSFT", "Close"), [5.0, 6.0])
+        np.testing.assert_array_equal(
+            PricePanel.open(self.root, "1d").column("MSFT", "Close"), [5, 6, 7, 8]
+        )
+
+    def test_new_tickers_are_added_and_backfilled(self):
+        from panel import PricePanel, build_panel
+
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-01", [1.0, 2.0, 3.0])})
+        build_panel(
+            self.root,
+            "1d",
+            {
+                "AAPL": _frame("2024-01-01", [1.0, 2.0, 3.0, 4.0]),
+                "MSFT": _frame("2024-01-02", [20.0, 30.0, 40.0]),
+            },
+        )
+        reader = PricePanel.open(self.root, "1d")
+        self.assertEqual(reader.tickers, ["AAPL", "MSFT"])
+        np.testing.assert_array_equal(reader.column("AAPL", "Close"), [1, 2, 3, 4])
+        close = reader.column("MSFT", "Close")
+        self.assertTrue(np.isnan(close[0]))
+        np.testing.assert_array_equal(close[1:], [20, 30, 40])
+
+    def test_shared_panel_reopened_only_after_update(self):
+        from panel import build_panel, open_shared
+
+        self.assertIsNone(open_shared(self.root, "1d"))
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-01", [1.0, 2.0])})
+        first = open_shared(self.root, "1d")
+        self.assertIs(open_shared(self.root, "1d"), first)
+        build_panel(self.root, "1d", {"AAPL": _frame("2024-01-03", [3.0])})
+        second = open_shared(self.root, "1d")
+        self.assertIsNot(second, first)
+        self.assertEqual(second.length, 3)
+
+    def test_catch_up_period_covers_the_gap(self):
+        from data import catch_up_period
+
+        now = pd.Timestamp("2024-03-01")
+        self.assertEqual(catch_up_period(None), "1y")
+        self.assertEqual(catch_up_period(pd.Timestamp("2024-02-28"), now), "5d")
+        self.assertEqual(catch_up_period(pd.Timestamp("2024-02-10"), now), "1mo")
+        self.assertEqual(catch_up_period(pd.Timestamp("2023-12-01"), now), "6mo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+import preprocess
+
+
+class TestPrepareTexts(unittest.TestCase):
+    def test_filters_and_collapses_duplicates(self):
+        texts = [
+            "apple beats earnings expectations again this quarter",
+            "",
+            "buy now",
+            "apple beats earnings expectations again this quarter",
+            "rt bot123 apple beats earnings expectations again this quarter",
+            "microsoft cloud revenue misses analyst estimates badly",
+        ]
+        groups, assignment, stats = preprocess.prepare_texts(texts)
+
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(assignment, [0, None, None, 0, 0, 1])
+        self.assertEqual(stats["empty"], 1)
+        self.assertEqual(stats["too_short"], 1)
+        self.assertEqual(stats["exact_duplicates"], 2)
+        self.assertEqual(stats["unique"], 2)
+        self.assertEqual(preprocess.group_weights(assignment, len(groups)), [3, 1])
+
+    def test_near_duplicates_grouped(self):
+        base = (
+            "huge breakout on nvda today join my discord for the next big "
+            "options play before it runs again tomorrow morning"
+        )
+        texts = [base, base + " now", "fed holds rates steady as inflation cools further"]
+        groups, assignment, stats = preprocess.prepare_texts(texts, max_distance=8)
+        self.assertEqual(assignment[0], assignment[1])
+        self.assertEqual(stats["near_duplicates"], 1)
+        self.assertEqual(len(groups), 2)
+
+    def test_near_duplicate_detection_can_be_disabled(self):
+        base = "huge breakout on nvda today join my discord for the next big play"
+        groups, _, stats = preprocess.prepare_texts([base, base + " now"], max_distance=0)
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(stats["near_duplicates"], 0)
+
+    def test_simhash_is_stable(self):
+        tokens = ["stock", "market", "rally"]
+        self.assertEqual(preprocess.simhash(tokens), preprocess.simhash(list(tokens)))
+
+
+if __name__ == "__main__":
+    unittest.main()
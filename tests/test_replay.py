@@ -0,0 +1,98 @@
+import json
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+import replay
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        self.calls = []
+
+    def tearDown(self) -> None:
+        replay._settings = None
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def fetch(self, ticker):
+        self.calls.append(ticker)
+        return {"ticker": ticker}
+
+    def test_record_then_replay(self):
+        replay.configure(mode="record", fixtures=self.tmp)
+        self.assertEqual(replay.io_call("prices", ("AAPL",), self.fetch, "AAPL"), {"ticker": "AAPL"})
+        streamed = list(replay.io_stream("rows", ("q",), lambda: iter([1, 2, 3])))
+        self.assertEqual(streamed, [1, 2, 3])
+
+        replay.configure(mode="replay", fixtures=self.tmp, fallback=False)
+        self.assertEqual(replay.io_call("prices", ("AAPL",), self.fetch, "AAPL"), {"ticker": "AAPL"})
+        self.assertEqual(list(replay.io_stream("rows", ("q",), self.fail_if_called)), [1, 2, 3])
+        self.assertEqual(self.calls, ["AAPL"])
+        with self.assertRaises(replay.ReplayError):
+            replay.io_call("prices", ("MSFT",), self.fetch, "MSFT")
+        self.assertEqual(replay.io_call("prices", ("MSFT",), self.fetch, "MSFT", failure_value=[]), [])
+
+        replay.configure(fallback=True)
+        self.assertEqual(replay.io_call("prices", ("T00001",), self.fetch, "T00001"), {"ticker": "AAPL"})
+
+    def test_injected_failures(self):
+        replay.configure(mode="record", fixtures=self.tmp)
+        replay.io_call("prices", ("AAPL",), self.fetch, "AAPL")
+        replay.configure(mode="replay", failure_rate=1.0)
+        with self.assertRaises(replay.ReplayError):
+            replay.io_call("prices", ("AAPL",), self.fetch, "AAPL")
+        self.assertIsNone(replay.io_call("prices", ("AAPL",), self.fetch, "AAPL", failure_value=None))
+
+    def fail_if_called(self):
+        raise AssertionError("live call in replay mode")
+
+    def test_webhook_stub_receives_posts(self):
+        server = replay.serve_webhook()
+        try:
+            url = "http://%s:%d/webhook" % server.server_address
+            req = urllib.request.Request(
+                url,
+                data=json.dumps({"content": "hi"}).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(req) as resp:
+                self.assertEqual(resp.status, 204)
+        finally:
+            server.shutdown()
+        self.assertEqual(server.RequestHandlerClass.received, [{"content": "hi"}])
+
+    def test_loadtest_keeps_configured_io_settings(self):
+        config = {"io": {"latency_ms": 250, "failure_rate": 0.5, "fixtures": self.tmp}}
+        applied = {}
+
+        def fake_main():
+            applied.update(replay.settings())
+
+        main = types.ModuleType("main")
+        main.main = fake_main
+        main.load_config = lambda: {}
+        signals = types.ModuleType("signals")
+        signals.load_config = lambda: {"tickers": ["AAPL"]}
+        with patch("replay.load_config", return_value=config), \
+             patch.dict(sys.modules, {"main": main, "signals": signals}):
+            replay.loadtest(1, failure_rate=0.1)
+
+        self.assertEqual(applied["mode"], "replay")
+        self.assertEqual(applied["latency_ms"], 250)
+        self.assertEqual(applied["failure_rate"], 0.1)
+        self.assertEqual(applied["fixtures"], self.tmp)
+
+    def test_scaled_tickers(self):
+        self.assertEqual(
+            replay.scaled_tickers(["AAPL", "MSFT"], 2),
+            ["AAPL", "MSFT", "AAPL.X1", "MSFT.X1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
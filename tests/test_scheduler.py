@@ -57,15 +57,21 @@ dummy_webhook = types.ModuleType("discord_webhook")
 dummy_webhook.DiscordWebhook = object
 sys.modules["discord_webhook"] = dummy_webhook
 
+import metrics
+import model_manager
 import run_scheduler
 
 
 class FakeScheduler:
     def __init__(self):
-        self.minutes = None
+        self.jobs = {}
 
-    def add_job(self, func, trigger, *, minutes=None):
-        self.minutes = minutes
+    def add_job(self, func, trigger, *, minutes=None, start_date=None):
+        self.jobs[func.__name__] = (minutes, start_date)
+
+    @property
+    def minutes(self):
+        return self.jobs["run_job"][0]
 
     def start(self):
         pass
@@ -84,6 +90,40 @@ class TestScheduler(unittest.TestCase):
             run_scheduler.start()
         self.assertEqual(fake.minutes, 5)
 
+    def test_preloads_model_before_each_run(self):
+        fake = FakeScheduler()
+        config = {"schedule": {"every": "15 minutes"}}
+        model_cfg = {"idle_minutes": 10, "preload_minutes": 2}
+        with patch("run_scheduler.load_config", return_value=config), \
+             patch("run_scheduler.model_settings", return_value=model_cfg), \
+             patch("run_scheduler.BackgroundScheduler", return_value=fake), \
+             patch("run_scheduler.time.sleep", side_effect=KeyboardInterrupt):
+            run_scheduler.start()
+        minutes, start_date = fake.jobs["preload_model"]
+        self.assertEqual(minutes, 15)
+        self.assertIsNotNone(start_date)
+
+    def test_preload_metrics_reach_next_run(self):
+        manager = model_manager.ModelManager(object, name="sentiment")
+        rendered = []
+        metrics.reset()
+        with patch("run_scheduler.get_manager", return_value=manager), \
+             patch("run_scheduler.main.get_manager", return_value=manager), \
+             patch("run_scheduler.main.load_config", return_value={"tickers": []}), \
+             patch("run_scheduler.main.metrics.configure"), \
+             patch(
+                 "run_scheduler.main.metrics.write_prometheus",
+                 side_effect=lambda: rendered.append(metrics.render_prometheus()),
+             ):
+            run_scheduler.preload_model()
+            run_scheduler.main.main()
+
+        self.assertEqual(len(rendered), 1)
+        self.assertIn('name="model.loads"', rendered[0])
+        self.assertIn('name="model.preloads"', rendered[0])
+        # The window is reset after reporting, ready for the next run.
+        self.assertNotIn('name="model.loads"', metrics.render_prometheus())
+
 
 if __name__ == "__main__":
     unittest.main()
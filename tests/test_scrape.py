@@ -45,12 +45,41 @@ class TestScrapeFallback(unittest.TestCase):
         self.assertEqual(tweets, ['nitter tweet'])
         self.assertTrue(Path('tech_stocks_tweets.csv').exists())
 
+    def test_unique_tweets_deduplicated_across_queries(self):
+        def fake_playwright(query, limit):
+            shared = {'date': '2020', 'tweet_id': '7', 'content': 'Shared!', 'username': 'u'}
+            own = {'date': '2020', 'tweet_id': query, 'content': query, 'username': 'u'}
+            return [shared, own]
+
+        with patch('scrape.fetch_with_playwright', side_effect=fake_playwright):
+            tweets, keys = scrape.get_unique_tweets(['AAPL', 'MSFT', 'AAPL'], retries=1)
+        self.assertEqual(sorted(tweets), ['7', 'AAPL', 'MSFT'])
+        self.assertEqual(tweets['7']['content'], 'shared')
+        self.assertEqual(keys, {'AAPL': ['7', 'AAPL'], 'MSFT': ['7', 'MSFT']})
+
+    def test_iter_tweets_streams_and_caches(self):
+        rows = [
+            {'date': '2020', 'tweet_id': str(i), 'content': f'Tweet {i}!', 'username': 'u'}
+            for i in range(5)
+        ]
+        with patch('scrape.iter_with_playwright', return_value=iter(rows)), \
+             patch('scrape.read_csv_keys', wraps=scrape.read_csv_keys) as read_keys:
+            stream = scrape.iter_tweets(['stock market'], retries=1, chunk_size=2)
+            first = next(stream)
+            self.assertEqual(first, ('stock market', {**rows[0], 'content': 'tweet 0'}))
+            rest = list(stream)
+        self.assertEqual(len(rest), 4)
+        # The existing ids are read once, not on every chunk flush.
+        read_keys.assert_called_once()
+        with open('stock_market_tweets.csv') as f:
+            self.assertEqual(len(f.read().splitlines()), 6)
+
     def test_nitter_invalid_json_returns_empty(self):
         class DummyResp:
             status_code = 200
             def json(self):
                 raise ValueError('bad json')
-        with patch.object(scrape.requests, 'get', return_value=DummyResp(), create=True):
+        with patch.object(scrape.http_client, 'get', return_value=DummyResp()):
             tweets = scrape.fetch_from_nitter('query', 5)
         self.assertEqual(tweets, [])
 
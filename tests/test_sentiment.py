@@ -0,0 +1,99 @@
+import sys
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+# Dummy model dependencies so sentiment imports cleanly
+dummy_transformers = types.ModuleType("transformers")
+dummy_transformers.AutoModelForSequenceClassification = object
+dummy_transformers.AutoTokenizer = object
+dummy_transformers.pipeline = lambda *a, **k: None
+sys.modules.setdefault("transformers", dummy_transformers)
+sys.modules.setdefault("torch", types.ModuleType("torch"))
+
+import sentiment
+
+
+class FakePipeline:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return [
+            {"label": "NEGATIVE" if "down" in t else "POSITIVE", "score": 0.8}
+            for t in texts
+        ]
+
+
+TEXTS = [
+    "shares are up after strong earnings",
+    "shares are down after weak guidance",
+    "shares are up after strong earnings",
+    "ok",
+    "the market is up on rate cut hopes",
+]
+
+
+class TestStreamingSentiment(unittest.TestCase):
+    def test_running_mean(self):
+        mean = sentiment.RunningMean()
+        self.assertEqual(mean.mean, 0.0)
+        mean.add(1.0)
+        mean.add(-1.0, weight=3)
+        self.assertAlmostEqual(mean.mean, -0.5)
+
+    def test_stream_matches_batch_result(self):
+        fake = FakePipeline()
+        with patch.object(sentiment, "_pipeline", fake):
+            batch = sentiment.compute_sentiment(TEXTS)
+            streamed = sentiment.stream_sentiment(iter(TEXTS), batch_size=2, queue_size=1)
+        self.assertAlmostEqual(batch, streamed)
+        # Duplicate and too-short texts never reach the model.
+        self.assertEqual(sum(len(b) for b in fake.batches[1:]), 3)
+        self.assertTrue(all(len(b) <= 2 for b in fake.batches[1:]))
+
+    def test_stream_scores_yields_every_tag(self):
+        fake = FakePipeline()
+        items = [(i, text) for i, text in enumerate(TEXTS)]
+        with patch.object(sentiment, "_pipeline", fake):
+            tags = sorted(tag for tag, _ in sentiment.stream_scores(items, batch_size=8))
+        self.assertEqual(tags, [0, 1, 2, 4])
+
+    def test_producer_errors_are_raised(self):
+        def broken():
+            yield (0, "shares are up after strong earnings")
+            raise RuntimeError("scraper crashed")
+
+        with patch.object(sentiment, "_pipeline", FakePipeline()):
+            with self.assertRaises(RuntimeError):
+                list(sentiment.stream_scores(broken()))
+
+    def test_producer_stops_when_consumer_fails(self):
+        closed = []
+
+        def endless():
+            try:
+                i = 0
+                while True:
+                    yield (i, f"shares are up after strong earnings number {i}")
+                    i += 1
+            finally:
+                closed.append(True)
+
+        def oom(texts):
+            raise MemoryError("model OOM")
+
+        with patch.object(sentiment, "score_texts", side_effect=oom):
+            with self.assertRaises(MemoryError):
+                list(sentiment.stream_scores(endless(), batch_size=2, queue_size=1))
+
+        self.assertEqual(closed, [True])
+        self.assertFalse(
+            any(t.name == "sentiment-producer" for t in threading.enumerate())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
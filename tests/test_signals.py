@@ -0,0 +1,124 @@
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+# Dummy heavy dependencies so signals imports cleanly
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+yfinance = types.ModuleType("yfinance")
+yfinance.download = lambda *a, **k: types.SimpleNamespace(empty=False)
+sys.modules.setdefault("yfinance", yfinance)
+
+dummy_transformers = types.ModuleType("transformers")
+dummy_transformers.AutoModelForSequenceClassification = object
+dummy_transformers.AutoTokenizer = object
+dummy_transformers.pipeline = lambda *a, **k: None
+sys.modules.setdefault("transformers", dummy_transformers)
+
+pandas = types.ModuleType("pandas")
+pandas.DataFrame = object
+sys.modules.setdefault("pandas", pandas)
+
+for name in [
+    "torch",
+    "technical_analysis",
+    "technical_analysis.indicators",
+]:
+    sys.modules.setdefault(name, types.ModuleType(name))
+
+import signals
+
+CONFIG = {
+    "keywords": ["stock market"],
+    "thresholds": {
+        "rsi": {"buy": 30, "sell": 70},
+        "sentiment": {"buy": 0.2, "sell": -0.2},
+    },
+}
+
+INDICATORS = {
+    # Oversold with an uptrend: a BUY is still possible.
+    "AAPL": {"rsi": 25.0, "sma50": 110.0, "sma200": 100.0, "macd": 1.0},
+    # Neutral RSI: HOLD whatever the sentiment.
+    "MSFT": {"rsi": 50.0, "sma50": 110.0, "sma200": 100.0, "macd": 1.0},
+}
+
+
+def _indicators(ticker, df):
+    return {"ticker": ticker, "price_time": None, **INDICATORS[ticker]}
+
+
+class TestScreenUniverse(unittest.TestCase):
+    def test_sentiment_only_for_candidates(self):
+        with patch("signals.load_config", return_value=CONFIG), \
+             patch("signals.load_price", return_value=None), \
+             patch("signals.compute_indicators", side_effect=_indicators), \
+             patch("signals.ticker_sentiments", return_value={"AAPL": 0.5}) as sentiment:
+            results, stats = signals.screen_universe(["AAPL", "MSFT"])
+
+        sentiment.assert_called_once_with(["AAPL"], CONFIG)
+        self.assertEqual(results["AAPL"]["signal"], "BUY")
+        self.assertEqual(results["MSFT"]["signal"], "HOLD")
+        self.assertIsNone(results["MSFT"]["sentiment"])
+        self.assertEqual(stats["technical_candidates"], 1)
+        self.assertEqual(stats["pruned"], 1)
+
+    def test_no_candidates_skips_sentiment(self):
+        with patch("signals.load_config", return_value=CONFIG), \
+             patch("signals.load_price", return_value=None), \
+             patch("signals.compute_indicators", side_effect=_indicators), \
+             patch("signals.ticker_sentiments") as sentiment:
+            results, stats = signals.screen_universe(["MSFT"])
+
+        sentiment.assert_not_called()
+        self.assertEqual(stats["queries_scraped"], 0)
+
+    def test_evaluate_signal_reuses_sentiment_score(self):
+        with patch("signals.load_config", return_value=CONFIG), \
+             patch("signals.load_price", return_value=None), \
+             patch("signals.compute_indicators", side_effect=_indicators), \
+             patch("signals.ticker_sentiments") as sentiment:
+            result = signals.evaluate_signal("AAPL", sentiment_score=0.5)
+
+        sentiment.assert_not_called()
+        self.assertEqual(result["signal"], "BUY")
+        self.assertEqual(result["sentiment"], 0.5)
+
+    def test_decide_signal_matches_rules(self):
+        values = {"rsi": 80.0, "sma50": 90.0, "sma200": 100.0, "macd": -1.0}
+        self.assertEqual(signals.technical_sides(values, CONFIG), {"SELL"})
+        self.assertEqual(signals.decide_signal(values, -0.5, CONFIG), "SELL")
+        self.assertEqual(signals.decide_signal(values, 0.0, CONFIG), "HOLD")
+
+
+class TestTickerSentiments(unittest.TestCase):
+    def test_shared_tweets_scored_once(self):
+        config = {
+            "keywords": ["stock market"],
+            "queries": {"AAPL": ["$AAPL", "tech stocks"], "MSFT": ["$MSFT", "tech stocks"]},
+        }
+        tweets = {
+            "1": {"tweet_id": "1", "content": "apple shares rally after earnings"},
+            "2": {"tweet_id": "2", "content": "microsoft slides on weak cloud guidance"},
+            "3": {"tweet_id": "3", "content": "tech sector flat going into the close"},
+        }
+        keys_by_query = {"$AAPL": ["1", "3"], "$MSFT": ["2"], "tech stocks": ["3"]}
+        scores = {
+            "apple shares rally after earnings": 1.0,
+            "microsoft slides on weak cloud guidance": -1.0,
+            "tech sector flat going into the close": 0.0,
+        }
+        with patch("signals.get_unique_tweets", return_value=(tweets, keys_by_query)) as scrape, \
+             patch("signals.score_texts", side_effect=lambda texts: [scores[t] for t in texts]) as score:
+            result = signals.ticker_sentiments(["AAPL", "MSFT", "GOOGL"], config)
+
+        scrape.assert_called_once_with(["$AAPL", "tech stocks", "$MSFT", "tech stocks", "stock market"])
+        self.assertEqual(sorted(score.call_args[0][0]), sorted(scores))
+        self.assertEqual(result["AAPL"], 0.5)
+        self.assertEqual(result["MSFT"], -0.5)
+        self.assertEqual(result["GOOGL"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import store
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        self.db = Path(self.tmp) / "signals.db"
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_latest_and_history(self):
+        store.save_result(
+            {"ticker": "AAPL", "signal": "HOLD", "rsi": 50.0, "computed_at": "2024-01-01T00:00:00"},
+            db_path=self.db,
+        )
+        store.save_result(
+            {"ticker": "AAPL", "signal": "BUY", "rsi": 25.0, "computed_at": "2024-01-01T00:15:00"},
+            db_path=self.db,
+        )
+        store.save_result(
+            {"ticker": "MSFT", "signal": "SELL", "sentiment": -0.5},
+            db_path=self.db,
+        )
+
+        latest = store.latest_results(db_path=self.db)
+        self.assertEqual(latest["AAPL"]["signal"], "BUY")
+        self.assertEqual(latest["MSFT"]["sentiment"], -0.5)
+        self.assertIsNotNone(latest["MSFT"]["computed_at"])
+
+        hist = store.history("AAPL", db_path=self.db)
+        self.assertEqual([r["signal"] for r in hist], ["HOLD", "BUY"])
+        self.assertEqual(len(store.history("AAPL", limit=1, db_path=self.db)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()